@@ -1,87 +1,431 @@
 from __future__ import annotations
 
+import atexit
+import mimetypes
 import os
+import queue
 import smtplib
-from collections.abc import Iterable
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from email.message import EmailMessage
+from functools import lru_cache
+from typing import NamedTuple
 
 from openrightofway.utils.logging import get_logger
+from openrightofway.utils.retry import retry
 
 logger = get_logger(__name__)
 
+# Upper bound on concurrent Twilio requests per send_sms call
+_SMS_MAX_WORKERS = 10
+
+
+def _is_permanent(e: BaseException) -> bool:
+    """Errors that a retry cannot fix.
+
+    That is rejected credentials, refused recipients, an SMTP 5xx reply or a 4xx (non-429)
+    API response.
+    """
+    if isinstance(e, (smtplib.SMTPAuthenticationError, smtplib.SMTPRecipientsRefused)):
+        return True
+    smtp_code = getattr(e, "smtp_code", None)
+    if isinstance(smtp_code, int) and smtp_code >= 500:
+        return True
+    status = getattr(e, "status", None)  # twilio.base.exceptions.TwilioRestException
+    return isinstance(status, int) and 400 <= status < 500 and status != 429
+
+
+class _PooledSMTP:
+    """An authenticated SMTP session owned by an SMTPPool."""
+
+    def __init__(self, server: smtplib.SMTP) -> None:
+        self.server = server
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+    def send_message(self, msg: EmailMessage, **kwargs) -> None:
+        self.server.send_message(msg, **kwargs)
+        self.sent += 1
+
+    def is_alive(self) -> bool:
+        try:
+            return self.server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def close(self) -> None:
+        try:
+            self.server.quit()
+        except (smtplib.SMTPException, OSError):
+            self.server.close()
+
+
+class SMTPPool:
+    """Reuse authenticated SMTP sessions instead of paying STARTTLS + LOGIN per email.
+
+    At most ``max_connections`` sessions are open at once. A session is recycled after
+    ``max_messages`` sends and closed by a background reaper once idle for
+    ``idle_timeout`` seconds.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        max_connections: int = 5,
+        max_messages: int = 100,
+        idle_timeout: float = 30.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.max_messages = max_messages
+        self.idle_timeout = idle_timeout
+        self._idle: queue.LifoQueue[_PooledSMTP] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._lock = threading.Lock()
+        self._reaper: threading.Thread | None = None
+        self._closed = False
+
+    def _connect(self) -> _PooledSMTP:
+        server = smtplib.SMTP(self.host, self.port)
+        try:
+            server.starttls()
+            server.login(self.username, self.password)
+        except BaseException:
+            server.close()
+            raise
+        return _PooledSMTP(server)
+
+    def _claim(self) -> _PooledSMTP:
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._connect()
+                if conn.is_alive():
+                    return conn
+                conn.close()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, conn: _PooledSMTP, healthy: bool) -> None:
+        try:
+            if healthy and not self._closed and conn.sent < self.max_messages:
+                conn.last_used = time.monotonic()
+                self._idle.put(conn)
+                self._start_reaper()
+            else:
+                conn.close()
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self) -> Iterator[_PooledSMTP]:
+        """Check out a live session; it is discarded instead of reused if the block raises."""
+        conn = self._claim()
+        try:
+            yield conn
+        except BaseException:
+            self._release(conn, healthy=False)
+            raise
+        self._release(conn, healthy=True)
+
+    def _start_reaper(self) -> None:
+        with self._lock:
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap, name="smtp-pool-reaper", daemon=True)
+                self._reaper.start()
+
+    def _reap(self) -> None:
+        while True:
+            time.sleep(self.idle_timeout)
+            now = time.monotonic()
+            keep: list[_PooledSMTP] = []
+            while True:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                if now - conn.last_used >= self.idle_timeout:
+                    conn.close()
+                else:
+                    keep.append(conn)
+            # Re-queue oldest first so the most recently used session is claimed next
+            for conn in reversed(keep):
+                self._idle.put(conn)
+            with self._lock:
+                if self._idle.empty():
+                    self._reaper = None
+                    return
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_SMTP_POOLS: dict[tuple[str, int, str], SMTPPool] = {}
+_SMTP_POOLS_LOCK = threading.Lock()
+
+
+def get_smtp_pool(host: str, port: int, username: str, password: str) -> SMTPPool:
+    """Return the process-wide SMTP pool for (host, port, username)."""
+    key = (host, port, username)
+    with _SMTP_POOLS_LOCK:
+        pool = _SMTP_POOLS.get(key)
+        if pool is None:
+            pool = _SMTP_POOLS[key] = SMTPPool(host, port, username, password)
+        return pool
+
+
+@atexit.register
+def _close_smtp_pools() -> None:
+    with _SMTP_POOLS_LOCK:
+        for pool in _SMTP_POOLS.values():
+            pool.close()
+        _SMTP_POOLS.clear()
+
+
+@retry(retry_on=(smtplib.SMTPException, OSError), give_up=_is_permanent)
+def _deliver(
+    pool: SMTPPool,
+    pending: deque[tuple[int, EmailMessage]],
+    results: list[Exception | None],
+) -> None:
+    # Messages are popped once handled, so a retry resumes with the unsent remainder. A
+    # permanent rejection is recorded in ``results`` and skipped; transient errors propagate
+    # so the whole remainder is retried.
+    with pool.connection() as conn:
+        while pending:
+            i, msg = pending[0]
+            try:
+                # smtplib takes recipients from To/Cc/Bcc and strips Bcc from the sent copy
+                conn.send_message(msg)
+            except smtplib.SMTPException as e:
+                if not _is_permanent(e):
+                    raise
+                logger.error("SMTP rejected email to %s: %s", msg["To"], e)
+                results[i] = e
+            pending.popleft()
+
+
+class Attachment(NamedTuple):
+    """File contents ready to attach; load once and reuse across messages and retries."""
+
+    filename: str
+    data: bytes
+    maintype: str
+    subtype: str
+
+
+def load_attachment(path: str) -> Attachment:
+    ctype, encoding = mimetypes.guess_type(path)
+    if ctype is None or encoding is not None:
+        # Unknown or compressed (e.g. .tar.gz): send as opaque bytes
+        ctype = "application/octet-stream"
+    maintype, subtype = ctype.split("/", 1)
+    with open(path, "rb") as f:
+        data = f.read()
+    return Attachment(os.path.basename(path), data, maintype, subtype)
+
+
+class NotifierEnv(NamedTuple):
+    """Twilio and SMTP settings read from the environment."""
+
+    twilio_sid: str | None
+    twilio_token: str | None
+    twilio_from: str | None
+    smtp_host: str | None
+    smtp_port: int
+    smtp_username: str | None
+    smtp_password: str | None
+    email_from: str | None
+
+
+@lru_cache(maxsize=1)
+def _load_env_once() -> NotifierEnv:
+    # Credentials do not change during a process lifetime; read them on first Notifier()
+    # rather than at import, so a malformed value only affects commands that notify
+    return NotifierEnv(
+        twilio_sid=os.getenv("TWILIO_ACCOUNT_SID"),
+        twilio_token=os.getenv("TWILIO_AUTH_TOKEN"),
+        twilio_from=os.getenv("TWILIO_FROM"),
+        smtp_host=os.getenv("SMTP_HOST"),
+        smtp_port=int(os.getenv("SMTP_PORT", "587")),
+        smtp_username=os.getenv("SMTP_USERNAME"),
+        smtp_password=os.getenv("SMTP_PASSWORD"),
+        email_from=os.getenv("EMAIL_FROM"),
+    )
+
+
+@lru_cache(maxsize=4)
+def _twilio_client(sid: str, token: str):
+    # Shared so repeated sends reuse the client's pooled HTTPS session
+    from twilio.rest import Client
+
+    return Client(sid, token)
+
 
 class Notifier:
-    def __init__(self) -> None:
-        # Twilio config via env
-        self.twilio_sid = os.getenv("TWILIO_ACCOUNT_SID")
-        self.twilio_token = os.getenv("TWILIO_AUTH_TOKEN")
-        self.twilio_from = os.getenv("TWILIO_FROM")
-
-        # SMTP config via env
-        self.smtp_host = os.getenv("SMTP_HOST")
-        self.smtp_port = int(os.getenv("SMTP_PORT", "587"))
-        self.smtp_username = os.getenv("SMTP_USERNAME")
-        self.smtp_password = os.getenv("SMTP_PASSWORD")
-        self.email_from = os.getenv("EMAIL_FROM")
-
-    def send_sms(self, to_numbers: Iterable[str], message: str) -> None:
+    def __init__(self, env: NotifierEnv | None = None) -> None:
+        self._env = env or _load_env_once()
+
+    @property
+    def twilio_sid(self) -> str | None:
+        return self._env.twilio_sid
+
+    @property
+    def twilio_token(self) -> str | None:
+        return self._env.twilio_token
+
+    @property
+    def twilio_from(self) -> str | None:
+        return self._env.twilio_from
+
+    @property
+    def smtp_host(self) -> str | None:
+        return self._env.smtp_host
+
+    @property
+    def smtp_port(self) -> int:
+        return self._env.smtp_port
+
+    @property
+    def smtp_username(self) -> str | None:
+        return self._env.smtp_username
+
+    @property
+    def smtp_password(self) -> str | None:
+        return self._env.smtp_password
+
+    @property
+    def email_from(self) -> str | None:
+        return self._env.email_from
+
+    def send_sms(self, to_numbers: Iterable[str], message: str) -> list[Exception | None]:
+        """Send ``message`` to every number, dispatching Twilio requests concurrently.
+
+        Returns one entry per recipient (in input order): ``None`` on success or the
+        exception raised for that recipient, so one failure does not abort the batch.
+        """
         numbers = list(to_numbers)
         if not numbers:
             logger.info("SMS: no recipients provided; skipping")
-            return
+            return []
         if self.twilio_sid and self.twilio_token and self.twilio_from:
             try:
-                from twilio.rest import Client
+                from twilio.base.exceptions import TwilioRestException
 
-                client = Client(self.twilio_sid, self.twilio_token)
-                for to in numbers:
-                    client.messages.create(body=message, from_=self.twilio_from, to=to)
-                logger.info("Sent SMS to %d recipients via Twilio", len(numbers))
-            except Exception as e:  # pragma: no cover - network dependent
+                client = _twilio_client(self.twilio_sid, self.twilio_token)
+                create = retry(retry_on=(TwilioRestException, OSError), give_up=_is_permanent)(
+                    client.messages.create
+                )
+            except Exception as e:  # pragma: no cover - optional dependency
                 logger.error("Failed to send SMS via Twilio: %s", e)
-        else:
-            # Fallback: log
-            for to in numbers:
-                logger.info("SMS to %s: %s", to, message)
+                return [e] * len(numbers)
 
-    def send_email(
+            def _send_one(to: str) -> Exception | None:
+                try:
+                    create(body=message, from_=self.twilio_from, to=to)
+                    return None
+                except Exception as e:  # pragma: no cover - network dependent
+                    logger.error("Failed to send SMS to %s via Twilio: %s", to, e)
+                    return e
+
+            with ThreadPoolExecutor(max_workers=min(len(numbers), _SMS_MAX_WORKERS)) as pool:
+                results = list(pool.map(_send_one, numbers))
+            sent = sum(1 for r in results if r is None)
+            logger.info("Sent SMS to %d/%d recipients via Twilio", sent, len(numbers))
+            return results
+        # Fallback: log
+        for to in numbers:
+            logger.info("SMS to %s: %s", to, message)
+        return [None] * len(numbers)
+
+    def build_email(
         self,
         to_emails: Iterable[str],
         subject: str,
         body: str,
-        attachments: Iterable[str] | None = None,
-    ) -> None:
-        emails = list(to_emails)
-        if not emails:
-            logger.info("Email: no recipients provided; skipping")
-            return
-
+        attachments: Iterable[str | Attachment] | None = None,
+    ) -> EmailMessage:
         msg = EmailMessage()
         msg["Subject"] = subject
         msg["From"] = self.email_from or "openrightofway@example.com"
-        msg["To"] = ", ".join(emails)
+        msg["To"] = ", ".join(to_emails)
         msg.set_content(body)
 
-        for path in (attachments or []):
+        for item in (attachments or []):
             try:
-                with open(path, "rb") as f:
-                    data = f.read()
-                maintype = "application"
-                subtype = "octet-stream"
-                msg.add_attachment(data, maintype=maintype, subtype=subtype, filename=os.path.basename(path))
+                att = load_attachment(item) if isinstance(item, str) else item
+                msg.add_attachment(att.data, maintype=att.maintype, subtype=att.subtype, filename=att.filename)
             except Exception as e:
-                logger.error("Failed to attach %s: %s", path, e)
+                logger.error("Failed to attach %s: %s", item if isinstance(item, str) else item.filename, e)
+        return msg
 
+    def send_email(
+        self,
+        to_emails: Iterable[str],
+        subject: str,
+        body: str,
+        attachments: Iterable[str | Attachment] | None = None,
+    ) -> list[Exception | None]:
+        emails = list(to_emails)
+        if not emails:
+            logger.info("Email: no recipients provided; skipping")
+            return []
+        return self.send_emails_bulk([self.build_email(emails, subject, body, attachments)])
+
+    def send_emails_bulk(
+        self, messages: Iterable[EmailMessage], flush_every: int = 20
+    ) -> list[Exception | None]:
+        """Send several messages over one pooled SMTP session.
+
+        Each message is a single MAIL FROM / RCPT TO... / DATA transaction carrying all of
+        its To/Cc/Bcc recipients. The session goes back to the pool every ``flush_every``
+        messages so the pool's recycling limits still apply to long batches.
+
+        Returns one entry per message (in input order): ``None`` on success or the exception
+        that stopped it, so one rejected message does not abort the batch.
+        """
+        msgs = list(messages)
+        if not msgs:
+            return []
         if self.smtp_host and self.smtp_username and self.smtp_password:
+            results: list[Exception | None] = [None] * len(msgs)
             try:
-                with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:  # pragma: no cover - network dependent
-                    server.starttls()
-                    server.login(self.smtp_username, self.smtp_password)
-                    server.send_message(msg)
-                logger.info("Sent email to %d recipients via SMTP", len(emails))
+                pool = get_smtp_pool(self.smtp_host, self.smtp_port, self.smtp_username, self.smtp_password)
             except Exception as e:  # pragma: no cover
                 logger.error("Failed to send email via SMTP: %s", e)
-        else:
-            # Fallback: log
-            logger.info("Email to %s: %s\n%s", ", ".join(emails), subject, body)
-
+                return [e] * len(msgs)
+            for start in range(0, len(msgs), flush_every):
+                pending = deque(enumerate(msgs[start : start + flush_every], start))
+                try:
+                    _deliver(pool, pending, results)
+                except Exception as e:
+                    # Retries exhausted: whatever is left in this chunk failed with ``e``
+                    logger.error("Failed to send %d email(s) via SMTP: %s", len(pending), e)
+                    for i, _ in pending:
+                        results[i] = e
+            sent = sum(1 for r in results if r is None)
+            logger.info("Sent %d/%d email(s) via SMTP", sent, len(msgs))
+            return results
+        # Fallback: log
+        for msg in msgs:
+            body = msg.get_body(preferencelist=("plain",))
+            logger.info("Email to %s: %s\n%s", msg["To"], msg["Subject"], body.get_content() if body else "")
+        return [None] * len(msgs)
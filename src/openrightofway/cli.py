@@ -1,32 +1,88 @@
 from __future__ import annotations
 
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import typer
 
 from openrightofway.alerts.notifier import Notifier
-from openrightofway.compliance.checks import check_setback
-from openrightofway.core.config import load_config
-from openrightofway.cv.change_detection import detect_changes
-from openrightofway.integrations.work_orders import WorkOrderManager
-from openrightofway.llm.openai_agent import summarize_events
-from openrightofway.ml.filter import FalsePositiveFilter, Features
-from openrightofway.reports.reporting import generate_report
-from openrightofway.scoring.threat import compute_threat
+from openrightofway.core.config import Config, load_config
 from openrightofway.utils.logging import get_logger
+from openrightofway.utils.serialization import dumps
+
+# Heavy modules (cv2, sklearn, ...) are imported inside the commands that use them so that
+# commands like `ticket`, `alert` and `--help` start quickly.
+if TYPE_CHECKING:
+    from openrightofway.integrations.work_orders import WorkOrderManager
+    from openrightofway.ml.filter import FalsePositiveFilter
 
 app = typer.Typer(add_completion=False, help="OpenRightOfWay CLI")
 logger = get_logger(__name__)
 
+_SMS_MAX_CHARS = 1500
+
+
+@dataclass(slots=True)
+class PipelineEvent:
+    """A scored detection; ``to_dict()`` gives the report/JSON shape."""
+
+    bbox: tuple[int, int, int, int]
+    area: int
+    centroid: tuple[float, float]
+    magnitude: float
+    ml_true_positive_proba: float
+    distance_m: float
+    threat_score: float
+    threat_level: str
+    threat_reasons: list[str]
+    compliance_ok: bool
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "bbox": self.bbox,
+            "area": self.area,
+            "centroid": self.centroid,
+            "magnitude": self.magnitude,
+            "ml_true_positive_proba": self.ml_true_positive_proba,
+            "distance_m": self.distance_m,
+            "threat": {
+                "score": self.threat_score,
+                "level": self.threat_level,
+                "reasons": self.threat_reasons,
+            },
+            "compliance_ok": self.compliance_ok,
+        }
+
+
+def _get_filter(model_path: str) -> FalsePositiveFilter:
+    """Loaded (or freshly trained) filter for ``model_path``, reused while the file is unchanged."""
+    try:
+        mtime_ns = os.stat(model_path).st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = 0
+    return _load_filter(model_path, mtime_ns)
+
+
+@lru_cache(maxsize=4)
+def _load_filter(model_path: str, mtime_ns: int) -> FalsePositiveFilter:
+    from openrightofway.ml.filter import FalsePositiveFilter
+
+    fpf = FalsePositiveFilter(model_path)
+    fpf.load_or_train()
+    return fpf
+
 
 @app.command()
 def train_model(model_path: str | None = typer.Option(None, help="Path to save/load model")):
     """Train or load the baseline ML model used for false positive reduction."""
     cfg = load_config()
     path = model_path or cfg.app.model_path
-    fpf = FalsePositiveFilter(model_path=path)
-    fpf.load_or_train()
+    _get_filter(path)
     typer.echo(f"Model ready at {path}")
 
 
@@ -40,6 +96,9 @@ def detect(
 
     Note: Without geospatial referencing, distances to pipeline cannot be computed in this command.
     """
+    from openrightofway.cv.change_detection import detect_changes
+    from openrightofway.reports.reporting import generate_report
+
     cfg = load_config()
     dets = detect_changes(
         before,
@@ -66,29 +125,24 @@ def detect(
         generate_report(report, summary="Change detection results", details=result)
         typer.echo(report)
     else:
-        typer.echo(json.dumps(result))
+        typer.echo(dumps(result))
 
 
-@app.command(name="pipeline-run")
-def pipeline_run(
-    before: str = typer.Option(..., help="Path to BEFORE image"),
-    after: str = typer.Option(..., help="Path to AFTER image"),
-    encroachment_type: str = typer.Option("unknown", help="Type: structure|road|equipment|water|unknown"),
-    latitude: float | None = typer.Option(None, help="Approximate latitude of event center (optional)"),
-    longitude: float | None = typer.Option(None, help="Approximate longitude of event center (optional)"),
-    report: str | None = typer.Option(None, help="Path to write JSON report"),
-):
-    """Run end-to-end pipeline: detect -> ML filter -> score -> compliance -> alert -> ticket -> report.
-
-    If latitude/longitude are provided, compliance and distance-sensitive scoring are evaluated.
-    """
-    cfg = load_config()
-    notifier = Notifier()
-    wom = WorkOrderManager(cfg.app.work_orders_db)
+def _score_pair(
+    before: str,
+    after: str,
+    encroachment_type: str,
+    latitude: float | None,
+    longitude: float | None,
+    cfg: Config,
+    fpf: FalsePositiveFilter,
+) -> list[PipelineEvent]:
+    """Detect -> ML filter -> score -> compliance for one image pair, without side effects."""
+    import numpy as np
 
-    # Ensure model is ready
-    fpf = FalsePositiveFilter(cfg.app.model_path)
-    fpf.load_or_train()
+    from openrightofway.compliance.checks import check_setback
+    from openrightofway.cv.change_detection import detect_changes
+    from openrightofway.scoring.threat import compute_threat_batch
 
     # Detect
     dets = detect_changes(
@@ -99,19 +153,19 @@ def pipeline_run(
         morphological_kernel=cfg.pipeline.morphological_kernel,
     )
 
-    # Filter (false-positive reduction)
-    kept = []
-    for d in dets:
-        proba = fpf.predict_proba(Features(area_pixels=d.area, magnitude=d.magnitude))
-        if proba >= 0.5:
-            kept.append((d, proba))
+    # Filter (false-positive reduction), scoring every detection in one batch
+    n = len(dets)
+    probas = fpf.predict_proba_many(
+        np.fromiter((d.area for d in dets), dtype=np.float64, count=n),
+        np.fromiter((d.magnitude for d in dets), dtype=np.float64, count=n),
+    ).tolist()
+    kept = [(d, proba) for d, proba in zip(dets, probas) if proba >= 0.5]
     logger.info("Kept %d/%d detections after ML filtering", len(kept), len(dets))
 
-    # Score + Compliance
-    from typing import Any as _Any  # local alias to avoid global import
-
-    events: list[dict[str, _Any]] = []
-    for d, proba in kept:
+    # Compliance
+    distances: list[float] = []
+    compliant: list[bool] = []
+    for _ in kept:
         distance_m = 100.0
         compliance_ok = True
         if latitude is not None and longitude is not None:
@@ -120,64 +174,117 @@ def pipeline_run(
             # Compliance evaluated against setback using this distance estimate.
             distance_m = 100.0  # User can override future versions with corridor input
             compliance_ok = check_setback(distance_m, cfg.compliance).setback_ok
-
-        threat = compute_threat(
-            encroachment_type=encroachment_type,
-            distance_m=distance_m,
-            compliance_ok=compliance_ok,
-            magnitude=d.magnitude,
-            area_pixels=d.area,
-        )
+        distances.append(distance_m)
+        compliant.append(compliance_ok)
+
+    # Score all kept detections at once; reasons come from the batch's components
+    batch = compute_threat_batch(
+        encroachment_type,
+        np.asarray(distances, dtype=np.float64),
+        np.asarray(compliant, dtype=bool),
+        np.fromiter((d.magnitude for d, _ in kept), dtype=np.float64, count=len(kept)),
+        np.fromiter((d.area for d, _ in kept), dtype=np.float64, count=len(kept)),
+    )
+    events: list[PipelineEvent] = []
+    for (d, proba), distance_m, compliance_ok, score, level, reasons in zip(
+        kept, distances, compliant, batch.scores.tolist(), batch.levels.tolist(), batch.reasons()
+    ):
         events.append(
-            {
-                "bbox": d.bbox,
-                "area": d.area,
-                "centroid": d.centroid,
-                "magnitude": d.magnitude,
-                "ml_true_positive_proba": proba,
-                "distance_m": distance_m,
-                "threat": {
-                    "score": threat.score,
-                    "level": threat.level,
-                    "reasons": threat.reasons,
-                },
-                "compliance_ok": compliance_ok,
-            }
+            PipelineEvent(
+                bbox=d.bbox,
+                area=d.area,
+                centroid=d.centroid,
+                magnitude=d.magnitude,
+                ml_true_positive_proba=proba,
+                distance_m=distance_m,
+                threat_score=score,
+                threat_level=level,
+                threat_reasons=reasons,
+                compliance_ok=compliance_ok,
+            )
         )
+    return events
 
-    # Notify and create ticket per high/critical events
-    alerts_sent: list[dict[str, str]] = []
-    tickets: list[dict[str, _Any]] = []
+
+def _open_tickets(
+    events: list[PipelineEvent],
+    encroachment_type: str,
+    latitude: float | None,
+    longitude: float | None,
+    wom: WorkOrderManager,
+) -> tuple[list[str], list[dict[str, Any]]]:
+    """Open a work order per high/critical event in one transaction.
+
+    Returns the per-event alert lines and the created tickets.
+    """
+    lines: list[str] = []
+    rows: list[tuple[str, str, str, float | None, float | None, str | None]] = []
     for ev in events:
-        if ev["threat"]["level"] in {"high", "critical"}:
+        if ev.threat_level in {"high", "critical"}:
             msg = (
-                f"Encroachment {encroachment_type} detected: score {ev['threat']['score']:.1f} "
-                f"level {ev['threat']['level']} at distance {ev['distance_m']:.1f}m"
-            )
-            # Alerts (if configured)
-            # Load recipients from config
-            if cfg.alerts.sms.enabled and cfg.alerts.sms.to:
-                notifier.send_sms(cfg.alerts.sms.to, msg)
-                alerts_sent.append({"type": "sms", "message": msg})
-            if cfg.alerts.email.enabled and cfg.alerts.email.to:
-                notifier.send_email(cfg.alerts.email.to, subject="OpenRightOfWay Alert", body=msg)
-                alerts_sent.append({"type": "email", "message": msg})
-
-            # Ticket
-            wo = wom.create(
-                title="Encroachment detected",
-                description=msg,
-                priority="high" if ev["threat"]["level"] == "high" else "critical",
-                latitude=latitude,
-                longitude=longitude,
-                evidence_path=None,
+                f"Encroachment {encroachment_type} detected: score {ev.threat_score:.1f} "
+                f"level {ev.threat_level} at distance {ev.distance_m:.1f}m"
             )
-            tickets.append({"id": wo.id, "status": wo.status})
+            lines.append(msg)
+            priority = "high" if ev.threat_level == "high" else "critical"
+            rows.append(("Encroachment detected", msg, priority, latitude, longitude, None))
+    orders = wom.create_many(rows) if rows else []
+    return lines, [{"id": wo.id, "status": wo.status} for wo in orders]
+
+
+def _send_alerts(lines: list[str], cfg: Config, notifier: Notifier) -> list[dict[str, str]]:
+    """Send one SMS and one email covering every alert line (if configured)."""
+    alerts_sent: list[dict[str, str]] = []
+    if not lines:
+        return alerts_sent
+    msg = "\n".join(lines)
+    if cfg.alerts.sms.enabled and cfg.alerts.sms.to:
+        # Stay under Twilio's 1600-character body limit
+        sms = msg[:_SMS_MAX_CHARS]
+        notifier.send_sms(cfg.alerts.sms.to, sms)
+        alerts_sent.append({"type": "sms", "message": sms})
+    if cfg.alerts.email.enabled and cfg.alerts.email.to:
+        notifier.send_email(cfg.alerts.email.to, subject="OpenRightOfWay Alert", body=msg)
+        alerts_sent.append({"type": "email", "message": msg})
+    return alerts_sent
+
+
+@app.command(name="pipeline-run")
+def pipeline_run(
+    before: str = typer.Option(..., help="Path to BEFORE image"),
+    after: str = typer.Option(..., help="Path to AFTER image"),
+    encroachment_type: str = typer.Option("unknown", help="Type: structure|road|equipment|water|unknown"),
+    latitude: float | None = typer.Option(None, help="Approximate latitude of event center (optional)"),
+    longitude: float | None = typer.Option(None, help="Approximate longitude of event center (optional)"),
+    report: str | None = typer.Option(None, help="Path to write JSON report"),
+):
+    """Run end-to-end pipeline: detect -> ML filter -> score -> compliance -> alert -> ticket -> report.
+
+    If latitude/longitude are provided, compliance and distance-sensitive scoring are evaluated.
+    """
+    from openrightofway.integrations.work_orders import WorkOrderManager
+    from openrightofway.llm.openai_agent import summarize_events
+    from openrightofway.reports.reporting import generate_report
+
+    # Normalize once so per-event scoring hits the type table without lower()
+    encroachment_type = encroachment_type.lower()
+    cfg = load_config()
+    notifier = Notifier()
+    wom = WorkOrderManager(cfg.app.work_orders_db)
+
+    # Ensure model is ready
+    fpf = _get_filter(cfg.app.model_path)
+
+    events = _score_pair(before, after, encroachment_type, latitude, longitude, cfg, fpf)
+
+    lines, tickets = _open_tickets(events, encroachment_type, latitude, longitude, wom)
+    wom.close()
+    alerts_sent = _send_alerts(lines, cfg, notifier)
 
     result = {
         "before": before,
         "after": after,
-        "events": events,
+        "events": [ev.to_dict() for ev in events],
         "alerts": alerts_sent,
         "tickets": tickets,
     }
@@ -194,7 +301,103 @@ def pipeline_run(
         generate_report(path, summary="Pipeline run", details=result)
         typer.echo(path)
     else:
-        typer.echo(json.dumps(result))
+        typer.echo(dumps(result))
+
+
+def _process_pair(pair: dict[str, Any], cfg: Config) -> list[PipelineEvent]:
+    """Worker for pipeline-run-batch: score one pair; alerts and tickets stay in the parent."""
+    # Forked workers inherit the parent's cached filter; spawned ones load it once each
+    fpf = _get_filter(cfg.app.model_path)
+    return _score_pair(
+        pair["before"],
+        pair["after"],
+        pair.get("encroachment_type", "unknown"),
+        pair.get("latitude"),
+        pair.get("longitude"),
+        cfg,
+        fpf,
+    )
+
+
+@app.command(name="pipeline-run-batch")
+def pipeline_run_batch(
+    pairs_json: str = typer.Option(
+        ...,
+        help="JSON file with a list of {before, after, encroachment_type?, latitude?, longitude?}",
+    ),
+    workers: int | None = typer.Option(None, min=1, help="Worker processes (default: CPU count)"),
+    report: str | None = typer.Option(None, help="Path to write JSON report"),
+):
+    """Run pipeline-run over many image pairs using a pool of worker processes.
+
+    Workers detect, filter and score. Tickets are created from this process so the work
+    orders DB has a single writer, and one summary SMS/email covers the whole batch.
+    """
+    from openrightofway.integrations.work_orders import WorkOrderManager
+    from openrightofway.reports.reporting import generate_report
+
+    cfg = load_config()
+    pairs = json.loads(Path(pairs_json).read_text(encoding="utf-8"))
+    if not isinstance(pairs, list) or not all(
+        isinstance(p, dict) and "before" in p and "after" in p for p in pairs
+    ):
+        raise typer.BadParameter(
+            "expected a JSON list of objects with 'before' and 'after'", param_hint="--pairs-json"
+        )
+    for pair in pairs:
+        pair["encroachment_type"] = str(pair.get("encroachment_type") or "unknown").lower()
+
+    # Train (if needed) once up front so workers only load the persisted model
+    _get_filter(cfg.app.model_path)
+
+    scored: list[list[PipelineEvent]] = [[] for _ in pairs]
+    # A failing pair (unreadable image, ...) is reported in its run; the rest still proceed
+    errors: dict[int, str] = {}
+    if pairs:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = {pool.submit(_process_pair, pair, cfg): i for i, pair in enumerate(pairs)}
+            for fut in as_completed(futures):
+                i = futures[fut]
+                try:
+                    scored[i] = fut.result()
+                except Exception as e:
+                    logger.error("Pair %s -> %s failed: %s", pairs[i]["before"], pairs[i]["after"], e)
+                    errors[i] = str(e)
+
+    notifier = Notifier()
+    wom = WorkOrderManager(cfg.app.work_orders_db)
+    all_lines: list[str] = []
+    runs: list[dict[str, Any]] = []
+    for i, (pair, events) in enumerate(zip(pairs, scored)):
+        if i in errors:
+            runs.append({"before": pair["before"], "after": pair["after"], "error": errors[i]})
+            continue
+        lines, tickets = _open_tickets(
+            events,
+            pair.get("encroachment_type", "unknown"),
+            pair.get("latitude"),
+            pair.get("longitude"),
+            wom,
+        )
+        all_lines.extend(lines)
+        runs.append(
+            {
+                "before": pair["before"],
+                "after": pair["after"],
+                "events": [ev.to_dict() for ev in events],
+                "tickets": tickets,
+            }
+        )
+    wom.close()
+    # A single summary SMS/email for the whole batch
+    alerts_sent = _send_alerts(all_lines, cfg, notifier)
+
+    result = {"runs": runs, "alerts": alerts_sent}
+    if report:
+        generate_report(report, summary="Pipeline batch run", details=result)
+        typer.echo(report)
+    else:
+        typer.echo(dumps(result))
 
 
 @app.command()
@@ -203,6 +406,8 @@ def summarize_report(
     write: bool = typer.Option(False, help="Write a sibling *_summary.txt file instead of printing"),
 ):
     """Summarize a JSON report using the configured LLM (falls back to deterministic summary)."""
+    from openrightofway.llm.openai_agent import summarize_events
+
     cfg = load_config()
     p = Path(report)
     data = json.loads(p.read_text(encoding="utf-8"))
@@ -240,9 +445,12 @@ def ticket(
     priority: str = typer.Option("high"),
 ):
     """Create a work order ticket in the local database."""
+    from openrightofway.integrations.work_orders import WorkOrderManager
+
     cfg = load_config()
     wom = WorkOrderManager(cfg.app.work_orders_db)
     wo = wom.create(title=title, description=description, priority=priority)
+    wom.close()
     typer.echo(json.dumps({"id": wo.id, "status": wo.status}))
 
 
@@ -5,21 +5,19 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
-import yaml  # type: ignore[import-untyped]
-
 from openrightofway.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class AppSettings:
     model_path: str = "models/baseline.joblib"
     reports_dir: str = "reports"
     work_orders_db: str = "work_orders.db"
 
 
-@dataclass
+@dataclass(slots=True)
 class PipelineSettings:
     pipeline_buffer_meters: int = 15
     min_contour_area: int = 200
@@ -27,43 +25,48 @@ class PipelineSettings:
     morphological_kernel: int = 3
 
 
-@dataclass
+@dataclass(slots=True)
 class AlertsSMS:
     enabled: bool = False
     to: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class AlertsEmail:
     enabled: bool = False
     to: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class AlertsSettings:
     sms: AlertsSMS = field(default_factory=AlertsSMS)
     email: AlertsEmail = field(default_factory=AlertsEmail)
 
 
-@dataclass
+@dataclass(slots=True)
 class ComplianceSettings:
     setback_meters: int = 15
 
 
-@dataclass
+@dataclass(slots=True)
 class ReportingSettings:
     include_images: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMSettings:
     enabled: bool = False
     provider: str = "openai"
     model: str = "gpt-4o-mini"
     max_tokens: int = 400
+    cache_db: str = "llm_cache.db"
+    cache_ttl: int = 86400
+    semantic_cache: bool = False
+    semantic_threshold: float = 0.93
+    embedding_model: str = "text-embedding-3-small"
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     app: AppSettings = field(default_factory=AppSettings)
     pipeline: PipelineSettings = field(default_factory=PipelineSettings)
@@ -91,26 +94,53 @@ _DEFAULTS: dict[str, Any] = {
     },
     "compliance": {"setback_meters": 15},
     "reporting": {"include_images": True},
-    "llm": {"enabled": False, "provider": "openai", "model": "gpt-4o-mini", "max_tokens": 400},
+    "llm": {
+        "enabled": False,
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "max_tokens": 400,
+        "cache_db": "llm_cache.db",
+        "cache_ttl": 86400,
+        "semantic_cache": False,
+        "semantic_threshold": 0.93,
+        "embedding_model": "text-embedding-3-small",
+    },
+}
+
+
+# Env var -> app setting it overrides
+_ENV_OVERRIDES = {
+    "OROW_MODEL_PATH": "model_path",
+    "OROW_REPORTS_DIR": "reports_dir",
+    "OROW_WORK_ORDERS_DB": "work_orders_db",
 }
 
+# (cwd, config path, config mtime_ns, env override values) -> Config
+_CACHE: dict[tuple[str, str, int, tuple[str | None, ...]], Config] = {}
+
 
-def _merge_dicts(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
-    result = dict(base)
-    for k, v in override.items():
-        if isinstance(v, dict) and isinstance(base.get(k), dict):
-            result[k] = _merge_dicts(base[k], v)
-        else:
-            result[k] = v
-    return result
+def _merge_with_defaults(file_cfg: dict[str, Any]) -> dict[str, Any]:
+    """Overlay file values on _DEFAULTS; the schema is fixed, so one level per section suffices."""
+    merged = {sec: {**defaults, **(file_cfg.get(sec) or {})} for sec, defaults in _DEFAULTS.items()}
+    file_alerts = file_cfg.get("alerts") or {}
+    merged["alerts"] = {
+        channel: {**defaults, **(file_alerts.get(channel) or {})}
+        for channel, defaults in _DEFAULTS["alerts"].items()
+    }
+    return merged
 
 
 def load_yaml(path: Path) -> dict[str, Any]:
     if not path.exists():
         logger.info("Config file %s not found; using defaults", path)
         return {}
+    # Imported lazily: warm load_config() calls are served from the cache without YAML
+    import yaml  # type: ignore[import-untyped]
+
+    # libyaml-backed loader when PyYAML was built with it; same semantics as safe_load
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
     with path.open("r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+        data = yaml.load(f, Loader=loader) or {}
         if not isinstance(data, dict):
             raise ValueError(f"Config at {path} must be a YAML mapping")
         return data
@@ -152,23 +182,30 @@ def load_config(path: str | None = None) -> Config:
       - OROW_MODEL_PATH
       - OROW_REPORTS_DIR
       - OROW_WORK_ORDERS_DB
+
+    Results are cached until the file's mtime or an override changes; the returned
+    Config is shared between callers and should be treated as read-only.
     """
     cfg_path = Path(path) if path else Path("configs/settings.yaml")
-    file_cfg = load_yaml(cfg_path)
-    merged = _merge_dicts(_DEFAULTS, file_cfg)
+    try:
+        mtime_ns = cfg_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = 0
+    env = tuple(os.getenv(k) for k in _ENV_OVERRIDES)
+    key = (os.getcwd(), str(cfg_path), mtime_ns, env)
+    cached = _CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    merged = _merge_with_defaults(load_yaml(cfg_path))
 
     # Environment overrides
-    app_overrides: dict[str, Any] = {}
-    if os.getenv("OROW_MODEL_PATH"):
-        app_overrides["model_path"] = os.getenv("OROW_MODEL_PATH")
-    if os.getenv("OROW_REPORTS_DIR"):
-        app_overrides["reports_dir"] = os.getenv("OROW_REPORTS_DIR")
-    if os.getenv("OROW_WORK_ORDERS_DB"):
-        app_overrides["work_orders_db"] = os.getenv("OROW_WORK_ORDERS_DB")
-    if app_overrides:
-        merged["app"] = _merge_dicts(merged.get("app", {}), app_overrides)
+    for setting, value in zip(_ENV_OVERRIDES.values(), env):
+        if value:
+            merged["app"][setting] = value
 
     cfg = from_dict(merged)
     ensure_dirs(cfg)
+    _CACHE[key] = cfg
     return cfg
 
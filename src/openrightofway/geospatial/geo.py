@@ -1,21 +1,85 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
+import shapely
 from pyproj import CRS, Transformer
 from shapely.geometry import LineString, MultiLineString, MultiPolygon, Point, Polygon, shape
 from shapely.geometry.base import BaseGeometry
-from shapely.ops import unary_union
+from shapely.prepared import PreparedGeometry, prep
+from shapely.strtree import STRtree
 
 from openrightofway.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 
+@dataclass
+class _SegmentIndex:
+    """Projected corridor edges in an STRtree, for log-time nearest-distance queries."""
+
+    segments: np.ndarray  # LineString per vertex pair
+    tree: STRtree
+    interior: PreparedGeometry | None  # polygonal corridors: points inside are at distance 0
+
+    @classmethod
+    def build(cls, geom: BaseGeometry) -> _SegmentIndex:
+        polygonal = geom.geom_type in ("Polygon", "MultiPolygon")
+        lines = geom.boundary if polygonal else geom
+        parts = [shapely.get_coordinates(part) for part in shapely.get_parts(lines)]
+        segments = np.concatenate(
+            [shapely.linestrings(np.stack([c[:-1], c[1:]], axis=1)) for c in parts if len(c) >= 2]
+        )
+        return cls(segments=segments, tree=STRtree(segments), interior=prep(geom) if polygonal else None)
+
+    def distance(self, pt: Point) -> float:
+        if self.interior is not None and self.interior.contains(pt):
+            return 0.0
+        return float(self.segments[self.tree.nearest(pt)].distance(pt))
+
+
 @dataclass
 class Corridor:
     geometry: BaseGeometry
+    _proj_cache: dict[tuple[int, bool], BaseGeometry] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _index_cache: dict[tuple[int, bool], _SegmentIndex] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _buffered_prepared: dict[tuple[int, bool, float], PreparedGeometry] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def projected(self, zone: int, is_north: bool) -> BaseGeometry:
+        """Corridor geometry in the given UTM zone (metres), computed once per zone."""
+        key = (zone, is_north)
+        geom = self._proj_cache.get(key)
+        if geom is None:
+            fwd, _ = _transformers_for_zone(zone, is_north)
+            geom = shapely_transform_coords(self.geometry, fwd.transform)
+            self._proj_cache[key] = geom
+        return geom
+
+    def segment_index(self, zone: int, is_north: bool) -> _SegmentIndex:
+        """Spatial index over the projected corridor edges, built once per zone."""
+        key = (zone, is_north)
+        index = self._index_cache.get(key)
+        if index is None:
+            index = self._index_cache[key] = _SegmentIndex.build(self.projected(zone, is_north))
+        return index
+
+    def buffered(self, zone: int, is_north: bool, buffer_meters: float) -> PreparedGeometry:
+        """Prepared projected corridor grown by ``buffer_meters``, built once per (zone, buffer)."""
+        key = (zone, is_north, buffer_meters)
+        geom = self._buffered_prepared.get(key)
+        if geom is None:
+            geom = prep(self.projected(zone, is_north).buffer(buffer_meters))
+            self._buffered_prepared[key] = geom
+        return geom
 
 
 def _to_geometry(geom: BaseGeometry) -> BaseGeometry:
@@ -27,6 +91,8 @@ def _to_geometry(geom: BaseGeometry) -> BaseGeometry:
 def load_corridor(geojson_path: str) -> Corridor:
     import json
 
+    from shapely.ops import unary_union
+
     p = Path(geojson_path)
     if not p.exists():
         raise FileNotFoundError(f"Corridor file not found: {geojson_path}")
@@ -46,16 +112,15 @@ def load_corridor(geojson_path: str) -> Corridor:
     return Corridor(geometry=_to_geometry(merged))
 
 
-def _utm_crs_for_lonlat(lon: float, lat: float) -> CRS:
-    zone = int((lon + 180) / 6) + 1
-    is_north = lat >= 0
-    epsg = 32600 + zone if is_north else 32700 + zone
-    return CRS.from_epsg(epsg)
+def _utm_zone(lon: float, lat: float) -> tuple[int, bool]:
+    return int((lon + 180) / 6) + 1, lat >= 0
 
 
-def _build_transformers(sample_lon: float, sample_lat: float) -> tuple[Transformer, Transformer]:
+@lru_cache(maxsize=64)
+def _transformers_for_zone(zone: int, is_north: bool) -> tuple[Transformer, Transformer]:
+    # Building a Transformer initialises PROJ state; do it once per UTM zone
     src = CRS.from_epsg(4326)
-    dst = _utm_crs_for_lonlat(sample_lon, sample_lat)
+    dst = CRS.from_epsg(32600 + zone if is_north else 32700 + zone)
     fwd = Transformer.from_crs(src, dst, always_xy=True)
     inv = Transformer.from_crs(dst, src, always_xy=True)
     return fwd, inv
@@ -63,53 +128,34 @@ def _build_transformers(sample_lon: float, sample_lat: float) -> tuple[Transform
 
 def distance_to_corridor_meters(lon: float, lat: float, corridor: Corridor) -> float:
     """Approximate geodesic distance by local UTM projection."""
-    fwd, _ = _build_transformers(lon, lat)
+    zone, is_north = _utm_zone(lon, lat)
+    fwd, _ = _transformers_for_zone(zone, is_north)
     x, y = fwd.transform(lon, lat)
 
     # project corridor
     if corridor.geometry.is_empty:
         return float("inf")
 
-    # Transform each coordinate of the geometry to projected space
-    def _transform_geom(geom: BaseGeometry) -> BaseGeometry:
-        def _tx(xy):
-            return fwd.transform(xy[0], xy[1])
-
-        return shapely_transform_coords(geom, _tx)
-
-    proj_geom = _transform_geom(corridor.geometry)
-    return float(proj_geom.distance(Point(x, y)))
+    return corridor.segment_index(zone, is_north).distance(Point(x, y))
 
 
 def point_in_corridor_buffer(lon: float, lat: float, corridor: Corridor, buffer_meters: float) -> bool:
-    fwd, _ = _build_transformers(lon, lat)
+    zone, is_north = _utm_zone(lon, lat)
+    fwd, _ = _transformers_for_zone(zone, is_north)
     x, y = fwd.transform(lon, lat)
 
-    proj_geom = shapely_transform_coords(corridor.geometry, lambda xy: fwd.transform(xy[0], xy[1]))
-    return bool(proj_geom.buffer(buffer_meters).contains(Point(x, y)))
-
-
-def shapely_transform_coords(geom: BaseGeometry, tx_fn):
-    """Transform coordinates of a shapely geometry using tx_fn(xy)->(x,y)."""
-
-    def _recurse(g):
-        if g.geom_type == "Point":
-            x, y = tx_fn((g.x, g.y))
-            return Point(x, y)
-        elif g.geom_type == "LineString":
-            return LineString([tx_fn(xy) for xy in g.coords])
-        elif g.geom_type == "LinearRing":
-            from shapely.geometry import LinearRing
-            return LinearRing([tx_fn(xy) for xy in g.coords])
-        elif g.geom_type == "Polygon":
-            return Polygon([tx_fn(xy) for xy in g.exterior.coords],
-                           [ [tx_fn(xy) for xy in ring.coords] for ring in g.interiors ])
-        elif g.geom_type == "MultiLineString":
-            return MultiLineString([_recurse(p) for p in g.geoms])
-        elif g.geom_type == "MultiPolygon":
-            return MultiPolygon([_recurse(p) for p in g.geoms])
-        else:
-            return g
-
-    return _recurse(geom)
+    return bool(corridor.buffered(zone, is_north, buffer_meters).contains(Point(x, y)))
+
+
+def shapely_transform_coords(geom: BaseGeometry, tx_fn) -> BaseGeometry:
+    """Transform coordinates of a shapely geometry using tx_fn(xs, ys)->(xs, ys).
+
+    All vertices are passed as NumPy arrays in a single call, so a pyproj
+    ``Transformer.transform`` can be given directly.
+    """
+
+    def _bulk(coords: np.ndarray) -> np.ndarray:
+        xs, ys = tx_fn(coords[:, 0], coords[:, 1])
+        return np.column_stack([xs, ys])
 
+    return shapely.transform(geom, _bulk)
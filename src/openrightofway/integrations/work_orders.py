@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import logging
 import sqlite3
+import threading
+from collections.abc import Iterable
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -8,6 +11,14 @@ from openrightofway.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+_COLUMNS = "id, title, description, priority, latitude, longitude, evidence_path, status"
+_SQL_INSERT = (
+    "INSERT INTO work_orders (title, description, priority, latitude, longitude, evidence_path, status) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_SQL_GET = f"SELECT {_COLUMNS} FROM work_orders WHERE id=?"
+_SQL_UPDATE_STATUS = "UPDATE work_orders SET status=? WHERE id=?"
+
 
 @dataclass
 class WorkOrder:
@@ -22,63 +33,110 @@ class WorkOrder:
 
 
 class WorkOrderManager:
+    """SQLite-backed work order store.
+
+    A single connection is opened per manager and shared by reads and writes for its
+    lifetime; WAL mode with ``synchronous=NORMAL`` keeps commits cheap. Writes are serialized
+    with a lock and run inside explicit ``BEGIN IMMEDIATE``/``COMMIT`` transactions. Call
+    :meth:`close` when done: it checkpoints the WAL back into the main file, which readers
+    opening the DB with ``immutable=1`` (``db-serve``) rely on.
+    """
+
     def __init__(self, db_path: str) -> None:
         self.db_path = db_path
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            db_path, isolation_level=None, check_same_thread=False, cached_statements=256
+        )
+        self._closed = False
+        self._write_lock = threading.Lock()
+        for pragma in (
+            "PRAGMA journal_mode=WAL",
+            "PRAGMA synchronous=NORMAL",
+            "PRAGMA temp_store=MEMORY",
+            "PRAGMA cache_size=-64000",
+        ):
+            self._conn.execute(pragma)
         self._ensure_db()
+        # Get the schema into the main file right away for immutable readers
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
 
     def _ensure_db(self) -> None:
-        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS work_orders (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT NOT NULL,
-                    description TEXT NOT NULL,
-                    priority TEXT NOT NULL,
-                    latitude REAL,
-                    longitude REAL,
-                    evidence_path TEXT,
-                    status TEXT NOT NULL
-                )
-                """
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS work_orders (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                description TEXT NOT NULL,
+                priority TEXT NOT NULL,
+                latitude REAL,
+                longitude REAL,
+                evidence_path TEXT,
+                status TEXT NOT NULL
             )
-            conn.commit()
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_wo_status ON work_orders(status)")
+
+    def close(self) -> None:
+        if getattr(self, "_closed", True):
+            return
+        self._closed = True
+        with self._write_lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.close()
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
 
     def create(self, title: str, description: str, priority: str = "high", latitude: float | None = None,
                longitude: float | None = None, evidence_path: str | None = None) -> WorkOrder:
-        with sqlite3.connect(self.db_path) as conn:
-            cur = conn.execute(
-                "INSERT INTO work_orders (title, description, priority, latitude, longitude, evidence_path, status) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (title, description, priority, latitude, longitude, evidence_path, "open"),
-            )
-            conn.commit()
-            wo_id = int(cur.lastrowid) if cur.lastrowid is not None else 0
-        logger.info("Created work order %d", wo_id)
-        return WorkOrder(
-            id=wo_id,
-            title=title,
-            description=description,
-            priority=priority,
-            latitude=latitude,
-            longitude=longitude,
-            evidence_path=evidence_path,
-            status="open",
-        )
+        return self.create_many([(title, description, priority, latitude, longitude, evidence_path)])[0]
+
+    def create_many(
+        self, items: Iterable[tuple[str, str, str, float | None, float | None, str | None]]
+    ) -> list[WorkOrder]:
+        """Create open work orders in a single transaction.
+
+        Each item is ``(title, description, priority, latitude, longitude, evidence_path)``. Rows
+        are inserted with one ``executemany``; since the write lock and ``BEGIN IMMEDIATE`` make
+        this the only writer, AUTOINCREMENT hands out a contiguous id range ending at
+        ``last_insert_rowid()``.
+        """
+        rows = [(*item, "open") for item in items]
+        if not rows:
+            return []
+        with self._write_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(_SQL_INSERT, rows)
+                (last_id,) = self._conn.execute("SELECT last_insert_rowid()").fetchone()
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        first_id = int(last_id) - len(rows) + 1
+        orders = [WorkOrder(first_id + i, *row) for i, row in enumerate(rows)]
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Created %d work orders [%d..%d]", len(orders), first_id, orders[-1].id)
+        return orders
 
     def get(self, wo_id: int) -> WorkOrder | None:
-        with sqlite3.connect(self.db_path) as conn:
-            row = conn.execute(
-                "SELECT id, title, description, priority, latitude, longitude, evidence_path, status FROM work_orders WHERE id=?",
-                (wo_id,),
-            ).fetchone()
+        row = self._conn.execute(_SQL_GET, (wo_id,)).fetchone()
         if not row:
             return None
         return WorkOrder(*row)
 
     def update_status(self, wo_id: int, status: str) -> bool:
-        with sqlite3.connect(self.db_path) as conn:
-            cur = conn.execute("UPDATE work_orders SET status=? WHERE id=?", (status, wo_id))
-            conn.commit()
-            return cur.rowcount > 0
-
+        with self._write_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cur = self._conn.execute(_SQL_UPDATE_STATUS, (status, wo_id))
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return cur.rowcount > 0
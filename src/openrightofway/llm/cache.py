@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from openrightofway.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+_SQL_GET = "SELECT response, ts FROM llm_cache WHERE key=?"
+_SQL_SET = "INSERT OR REPLACE INTO llm_cache (key, response, ts, vec, ns) VALUES (?, ?, ?, ?, ?)"
+_SQL_DELETE = "DELETE FROM llm_cache WHERE key=?"
+_SQL_VECS = "SELECT key, response, ts, vec FROM llm_cache WHERE ns=? AND vec IS NOT NULL"
+
+
+def make_key(**parts: Any) -> str:
+    """SHA-256 of the canonical JSON of the request parts (model, prompts, limits)."""
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed response cache keyed by request hash, with a TTL in seconds.
+
+    Entries may also carry an embedding of the request (stored as fp16) and a namespace. When
+    :meth:`get` is given a query embedding and the exact key misses, the entry in the same
+    namespace with the highest cosine similarity at or above ``threshold`` is returned
+    instead. The namespace should cover every request part the embedding does not (model,
+    prompt, limits), so near matches never cross those. Embeddings are held in memory as one
+    normalized matrix per namespace, so a lookup is a single matrix-vector product.
+    """
+
+    def __init__(self, db_path: str, ttl: int = 86400, threshold: float = 0.93) -> None:
+        self.db_path = db_path
+        self.ttl = ttl
+        self.threshold = threshold
+        # Per-namespace (responses, timestamps, unit-norm float32 matrix), loaded lazily
+        self._index: dict[str, tuple[list[str], np.ndarray, np.ndarray]] = {}
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self._closed = False
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, response TEXT NOT NULL, ts INTEGER NOT NULL, vec BLOB, ns TEXT)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(llm_cache)")}
+        if "vec" not in columns:
+            self._conn.execute("ALTER TABLE llm_cache ADD COLUMN vec BLOB")
+        if "ns" not in columns:
+            self._conn.execute("ALTER TABLE llm_cache ADD COLUMN ns TEXT")
+
+    def _expired(self, ts: float, now: float) -> bool:
+        return self.ttl > 0 and now - ts > self.ttl
+
+    def get(self, key: str, vec: np.ndarray | None = None, namespace: str = "") -> str | None:
+        row = self._conn.execute(_SQL_GET, (key,)).fetchone()
+        if row is not None:
+            response, ts = row
+            if not self._expired(ts, time.time()):
+                logger.debug("LLM cache hit %s", key[:12])
+                return response
+            with self._lock:
+                self._conn.execute(_SQL_DELETE, (key,))
+                self._index.clear()
+        if vec is None:
+            return None
+        return self._get_similar(vec, namespace)
+
+    def _get_similar(self, vec: np.ndarray, namespace: str) -> str | None:
+        index = self._index.get(namespace)
+        if index is None:
+            index = self._index[namespace] = self._load_index(namespace)
+        responses, stamps, matrix = index
+        if not responses:
+            return None
+        q = np.asarray(vec, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(q))
+        if norm == 0.0 or q.shape[0] != matrix.shape[1]:
+            return None
+        sims = matrix @ (q / norm)
+        if self.ttl > 0:
+            sims[time.time() - stamps > self.ttl] = -1.0
+        best = int(np.argmax(sims))
+        if sims[best] < self.threshold:
+            return None
+        logger.debug("LLM semantic cache hit (cosine %.3f)", sims[best])
+        return responses[best]
+
+    def _load_index(self, namespace: str) -> tuple[list[str], np.ndarray, np.ndarray]:
+        rows = self._conn.execute(_SQL_VECS, (namespace,)).fetchall()
+        dim = max((len(r[3]) // 2 for r in rows), default=0)
+        rows = [r for r in rows if len(r[3]) // 2 == dim]
+        if not rows:
+            return [], np.empty(0), np.empty((0, 0), dtype=np.float32)
+        matrix = np.frombuffer(b"".join(r[3] for r in rows), dtype=np.float16)
+        matrix = matrix.reshape(len(rows), dim).astype(np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0.0, 1.0, norms)
+        stamps = np.fromiter((r[2] for r in rows), dtype=np.float64, count=len(rows))
+        return [r[1] for r in rows], stamps, matrix
+
+    def set(
+        self, key: str, response: str, vec: np.ndarray | None = None, namespace: str = ""
+    ) -> None:
+        blob = None if vec is None else np.asarray(vec, dtype=np.float16).ravel().tobytes()
+        with self._lock:
+            self._conn.execute(_SQL_SET, (key, response, int(time.time()), blob, namespace))
+            # The key may have replaced an embedded row in any namespace
+            self._index.clear()
+
+    def close(self) -> None:
+        if getattr(self, "_closed", True):
+            return
+        self._closed = True
+        self._conn.close()
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -1,18 +1,50 @@
 from __future__ import annotations
 
-import json
+import heapq
 import os
+from collections import Counter
+from functools import lru_cache
 from typing import Any
 
+import numpy as np
+
+from openrightofway.llm.cache import LLMCache, make_key
 from openrightofway.utils.logging import get_logger
+from openrightofway.utils.serialization import dumps
 
 logger = get_logger(__name__)
 
 
+_HIGH_LEVELS = frozenset({"high", "critical"})
+_TOP_K_EVENTS = 5
+# Kept low so summaries are near-deterministic and cached responses stand in for fresh ones
+_TEMPERATURE = 0.2
+_SYSTEM_PROMPT = (
+    "You summarize pipeline encroachment detection results for right-of-way monitoring. "
+    "Be concise and include counts, severity, and any compliance notes."
+)
+
+
 def _deterministic_summary(data: dict[str, Any]) -> str:
-    events: list[dict[str, Any]] = list(data.get("events", []))
-    total = len(events)
-    high_crit = sum(1 for e in events if e.get("threat", {}).get("level") in {"high", "critical"})
+    events = data.get("events", [])
+    total = 0
+    high_crit = 0
+    top: dict[str, Any] | None = None
+    top_threat: dict[str, Any] = {}
+    top_score = float("-inf")
+    # Single pass: count, tally high/critical and track the top-scoring event together
+    is_high = _HIGH_LEVELS.__contains__
+    to_float = float
+    for ev in events:
+        total += 1
+        th = ev.get("threat") or {}
+        if is_high(th.get("level")):
+            high_crit += 1
+        score = to_float(th.get("score", 0.0))
+        if score > top_score:
+            top_score = score
+            top = ev
+            top_threat = th
     alerts = len(data.get("alerts", []))
     tickets = len(data.get("tickets", []))
     parts = [
@@ -21,21 +53,78 @@ def _deterministic_summary(data: dict[str, Any]) -> str:
         f"Alerts sent: {alerts}",
         f"Tickets created: {tickets}",
     ]
-    if total:
-        # Include top-1 event brief
-        top = max(
-            events,
-            key=lambda ev: float(ev.get("threat", {}).get("score", 0.0)),
-        )
+    if top is not None:
         parts.append(
             "Top event: "
-            f"level={top.get('threat', {}).get('level')}, "
-            f"score={top.get('threat', {}).get('score')}, "
+            f"level={top_threat.get('level')}, "
+            f"score={top_threat.get('score')}, "
             f"distance_m={top.get('distance_m')}"
         )
     return "; ".join(parts)
 
 
+def _event_score(ev: dict[str, Any]) -> float:
+    return float((ev.get("threat") or {}).get("score", 0.0))
+
+
+def _llm_payload(data: dict[str, Any], top_k: int = _TOP_K_EVENTS) -> dict[str, Any]:
+    """Reduce pipeline results to counts plus the ``top_k`` highest-scoring events.
+
+    Keeps the prompt size independent of how many events a run produced.
+    """
+    events = data.get("events", [])
+    levels = Counter((ev.get("threat") or {}).get("level") for ev in events)
+    return {
+        "before": data.get("before"),
+        "after": data.get("after"),
+        "counts": {
+            "events": len(events),
+            "alerts": len(data.get("alerts", [])),
+            "tickets": len(data.get("tickets", [])),
+            "levels": {str(k): v for k, v in levels.items()},
+        },
+        "top_events": heapq.nlargest(top_k, events, key=_event_score),
+    }
+
+
+@lru_cache(maxsize=1)
+def _get_client() -> Any:
+    """Shared OpenAI client, so HTTP connections are reused across calls."""
+    # Lazy import to avoid dependency for users who don't enable LLM
+    from openai import OpenAI
+
+    return OpenAI()  # API key picked up from env
+
+
+@lru_cache(maxsize=4)
+def _response_cache(db_path: str, ttl: int, threshold: float) -> LLMCache:
+    return LLMCache(db_path, ttl=ttl, threshold=threshold)
+
+
+def _cache_for(llm_cfg: Any) -> LLMCache | None:
+    db_path = getattr(llm_cfg, "cache_db", "")
+    if not db_path:
+        return None
+    try:
+        return _response_cache(
+            db_path,
+            int(getattr(llm_cfg, "cache_ttl", 86400)),
+            float(getattr(llm_cfg, "semantic_threshold", 0.93)),
+        )
+    except Exception as e:
+        logger.warning("LLM cache at %s unavailable (%s); continuing without it", db_path, e)
+        return None
+
+
+def _embed(client: Any, model: str, text: str) -> np.ndarray | None:
+    try:
+        resp = client.embeddings.create(model=model, input=text)
+        return np.asarray(resp.data[0].embedding, dtype=np.float32)
+    except Exception as e:
+        logger.warning("Embedding request failed (%s); skipping semantic cache", e)
+        return None
+
+
 def summarize_events(data: dict[str, Any], cfg: Any) -> str:
     """Summarize pipeline results using OpenAI if configured; otherwise return a deterministic summary.
 
@@ -50,51 +139,67 @@ def summarize_events(data: dict[str, Any], cfg: Any) -> str:
         logger.warning("OPENAI_API_KEY not set; falling back to deterministic summary")
         return _deterministic_summary(data)
 
-    try:
-        # Lazy import to avoid dependency for users who don't enable LLM
-        from openai import OpenAI
+    model = getattr(cfg.llm, "model", "gpt-4o-mini")
+    max_tokens = int(getattr(cfg.llm, "max_tokens", 400))
+    payload = _llm_payload(data)
+    user = dumps(payload)
 
-        client = OpenAI()  # API key picked up from env
-        model = getattr(cfg.llm, "model", "gpt-4o-mini")
-        max_tokens = int(getattr(cfg.llm, "max_tokens", 400))
+    cache = _cache_for(cfg.llm)
+    key = make_key(model=model, sys=_SYSTEM_PROMPT, user=user, max_tokens=max_tokens)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
 
-        sys = (
-            "You summarize pipeline encroachment detection results for right-of-way monitoring. "
-            "Be concise and include counts, severity, and any compliance notes."
-        )
-        user = json.dumps(
-            {
-                "before": data.get("before"),
-                "after": data.get("after"),
-                "events": data.get("events", []),
-                "alerts": data.get("alerts", []),
-                "tickets": data.get("tickets", []),
-            }
-        )
+    try:
+        client = _get_client()
+        vec = None
+        namespace = ""
+        if cache is not None and getattr(cfg.llm, "semantic_cache", False):
+            embedding_model = getattr(cfg.llm, "embedding_model", "text-embedding-3-small")
+            # Near matches may only differ in event details, never in request settings or in
+            # which severity levels are present
+            namespace = make_key(
+                model=model,
+                sys=_SYSTEM_PROMPT,
+                max_tokens=max_tokens,
+                embedding_model=embedding_model,
+                levels=sorted(payload["counts"]["levels"]),
+            )
+            vec = _embed(client, embedding_model, user)
+            if vec is not None:
+                cached = cache.get(key, vec, namespace)
+                if cached is not None:
+                    return cached
         # Use chat.completions for broad compatibility; if unavailable, fallback
         try:
             resp = client.chat.completions.create(
                 model=model,
                 messages=[
-                    {"role": "system", "content": sys},
+                    {"role": "system", "content": _SYSTEM_PROMPT},
                     {"role": "user", "content": f"Summarize this JSON: {user}"},
                 ],
                 max_tokens=max_tokens,
-                temperature=0.2,
+                temperature=_TEMPERATURE,
             )
-            text = resp.choices[0].message.content or ""
-            return text.strip() or _deterministic_summary(data)
+            text = (resp.choices[0].message.content or "").strip()
+            if text and cache is not None:
+                cache.set(key, text, vec, namespace)
+            return text or _deterministic_summary(data)
         except Exception:
             # Responses API fallback if needed
             try:
                 resp = client.responses.create(
                     model=model,
-                    input=f"System: {sys}\nUser: Summarize this JSON: {user}",
+                    input=f"System: {_SYSTEM_PROMPT}\nUser: Summarize this JSON: {user}",
                     max_output_tokens=max_tokens,
                 )
                 # The Responses API returns content in a different structure
                 if getattr(resp, "output_text", None):
-                    return resp.output_text.strip()
+                    text = resp.output_text.strip()
+                    if text and cache is not None:
+                        cache.set(key, text, vec, namespace)
+                    return text
             except Exception:
                 logger.exception("OpenAI request failed; falling back to deterministic summary")
                 return _deterministic_summary(data)
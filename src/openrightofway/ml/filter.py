@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import math
+from collections.abc import Callable
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 import joblib
@@ -13,25 +16,70 @@ from openrightofway.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# (mu_area, mu_mag, sd_area, sd_mag, w_area, w_mag, bias)
+_Linear = tuple[float, float, float, float, float, float, float]
+
+
+def _label_numpy(
+    area: np.ndarray, mag: np.ndarray, noise: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    # True positive heuristic: larger area and higher magnitude
+    logits = 0.001 * (area - 500) + 0.02 * (mag - 30) + noise
+    y = (logits > 0.0).astype(np.int64)
+    X = np.column_stack([area.astype(float), mag.astype(float)])
+    return X, y
+
+
+def _label_loop(
+    area: np.ndarray, mag: np.ndarray, noise: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    # Same labelling as _label_numpy, fused into one pass for numba
+    n = area.shape[0]
+    X = np.empty((n, 2), dtype=np.float64)
+    y = np.empty(n, dtype=np.int64)
+    for i in range(n):
+        a = float(area[i])
+        m = float(mag[i])
+        X[i, 0] = a
+        X[i, 1] = m
+        y[i] = 1 if 0.001 * (a - 500.0) + 0.02 * (m - 30.0) + noise[i] > 0.0 else 0
+    return X, y
+
+
+@lru_cache(maxsize=1)
+def _label_kernel() -> Callable[[np.ndarray, np.ndarray, np.ndarray], tuple[np.ndarray, np.ndarray]]:
+    """JIT-compiled labelling loop when numba is installed, else the vectorized NumPy version.
+
+    numba is imported here rather than at module scope so that loading a saved model never
+    pays its import cost; ``cache=True`` keeps compiled code on disk across processes.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return _label_numpy
+    return njit(cache=True)(_label_loop)
+
 
 @dataclass
 class Features:
     area_pixels: int
     magnitude: float
 
-    def as_array(self) -> np.ndarray:
-        return np.array([[float(self.area_pixels), float(self.magnitude)]], dtype=float)
-
 
 class FalsePositiveFilter:
     def __init__(self, model_path: str) -> None:
         self.model_path = model_path
         self.clf: Pipeline | None = None
+        # Scaler mean/scale and LR weights/bias, folded out of the pipeline for fast scoring
+        self._linear: _Linear | None = None
+        # Reused (1, 2) input row for models scored through sklearn
+        self._buf = np.empty((1, 2), dtype=np.float64)
 
     def load_or_train(self) -> None:
         p = Path(self.model_path)
         if p.exists():
-            self.clf = joblib.load(p)
+            # Memory-map stored arrays so processes loading the same model share pages
+            self.clf = joblib.load(p, mmap_mode="r")
             logger.info("Loaded ML filter model from %s", p)
         else:
             logger.info("Model not found at %s; training baseline model", p)
@@ -39,17 +87,36 @@ class FalsePositiveFilter:
             p.parent.mkdir(parents=True, exist_ok=True)
             joblib.dump(self.clf, p)
             logger.info("Saved baseline model to %s", p)
+        self._linear = self._extract_linear(self.clf)
+
+    @staticmethod
+    def _extract_linear(clf: Pipeline) -> _Linear | None:
+        """Fold a scaler + binary LR pipeline into plain floats for scalar scoring.
+
+        Returns None for any other model shape, in which case prediction goes through sklearn.
+        """
+        try:
+            sc = clf.named_steps["scaler"]
+            lr = clf.named_steps["lr"]
+            mu, sd = sc.mean_, sc.scale_
+            w, b = lr.coef_, lr.intercept_
+        except (AttributeError, KeyError):
+            return None
+        if len(mu) != 2 or w.shape != (1, 2) or list(lr.classes_) != [0, 1]:
+            return None
+        return (
+            float(mu[0]), float(mu[1]), float(sd[0]), float(sd[1]),
+            float(w[0, 0]), float(w[0, 1]), float(b[0]),
+        )
 
-    def _train_baseline(self) -> Pipeline:
-        # Synthetic training data: area and magnitude with some noise
-        rng = np.random.default_rng(42)
-        n = 400
+    def _train_baseline(self, n: int = 400, seed: int = 42) -> Pipeline:
+        # Synthetic training data: area and magnitude with some noise. Draws stay in NumPy so
+        # the sample is identical with or without numba; only the labelling is JIT-compiled.
+        rng = np.random.default_rng(seed)
         area = rng.integers(50, 5000, size=n)
         mag = rng.uniform(0, 255, size=n)
-        # True positive heuristic: larger area and higher magnitude
-        logits = 0.001 * (area - 500) + 0.02 * (mag - 30) + rng.normal(0, 0.5, size=n)
-        y = (logits > 0.0).astype(int)
-        X = np.column_stack([area.astype(float), mag.astype(float)])
+        noise = rng.normal(0, 0.5, size=n)
+        X, y = _label_kernel()(area, mag, noise)
 
         clf = Pipeline(
             [
@@ -63,6 +130,32 @@ class FalsePositiveFilter:
     def predict_proba(self, feats: Features) -> float:
         if self.clf is None:
             raise RuntimeError("Model not loaded; call load_or_train() first")
-        proba = float(self.clf.predict_proba(feats.as_array())[0, 1])
-        return proba
+        if self._linear is not None:
+            mu0, mu1, sd0, sd1, w0, w1, b = self._linear
+            z = (feats.area_pixels - mu0) / sd0 * w0 + (feats.magnitude - mu1) / sd1 * w1 + b
+            # Numerically stable logistic, matching sklearn's expit
+            if z >= 0:
+                return 1.0 / (1.0 + math.exp(-z))
+            ez = math.exp(z)
+            return ez / (1.0 + ez)
+        buf = self._buf
+        buf[0, 0] = feats.area_pixels
+        buf[0, 1] = feats.magnitude
+        return float(self.clf.predict_proba(buf)[0, 1])
+
+    def predict_proba_many(self, areas: np.ndarray, magnitudes: np.ndarray) -> np.ndarray:
+        """True-positive probabilities for many detections at once, as a float64 array."""
+        if self.clf is None:
+            raise RuntimeError("Model not loaded; call load_or_train() first")
+        X = np.column_stack([areas, magnitudes]).astype(np.float64, copy=False)
+        if len(X) == 0:
+            return np.empty(0, dtype=np.float64)
+        if self._linear is None:
+            return self.clf.predict_proba(X)[:, 1]
+        mu0, mu1, sd0, sd1, w0, w1, b = self._linear
+        # Standardize and apply the LR weights in one matmul: z = X @ (w / sd) + (b - mu·w/sd)
+        coef = np.array([w0 / sd0, w1 / sd1])
+        z = X @ coef + (b - mu0 * coef[0] - mu1 * coef[1])
+        # sigmoid(z) = exp(-log(1 + exp(-z))), stable for large |z|
+        return np.exp(-np.logaddexp(0.0, -z))
 
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import bisect
+from collections.abc import Sequence
 from dataclasses import dataclass
 
+import numpy as np
+
 from openrightofway.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -14,16 +18,58 @@ class ThreatResult:
     reasons: list[str]
 
 
+_BASE_BY_TYPE = {
+    "structure": 40.0,
+    "road": 35.0,
+    "equipment": 25.0,
+    "water": 20.0,
+    "unknown": 15.0,
+}
+
+
 def _base_by_type(encroachment_type: str) -> float:
-    t = encroachment_type.lower()
-    mapping = {
-        "structure": 40.0,
-        "road": 35.0,
-        "equipment": 25.0,
-        "water": 20.0,
-        "unknown": 15.0,
-    }
-    return mapping.get(t, 15.0)
+    # The CLI passes lowercase types; only fall back to lower() for other callers
+    base = _BASE_BY_TYPE.get(encroachment_type)
+    if base is None:
+        base = _BASE_BY_TYPE.get(encroachment_type.lower(), 15.0)
+    return base
+
+
+# Level cut-offs: a score at or above _THRESHOLDS[i] (and below the next) maps to _LEVELS[i + 1]
+_THRESHOLDS = (40.0, 60.0, 80.0)
+_LEVELS = ("low", "medium", "high", "critical")
+_THRESHOLDS_ARR = np.array(_THRESHOLDS)
+_LEVELS_ARR = np.array(_LEVELS)
+
+# Sorted type keys and their base scores, for vectorized lookup with np.searchsorted
+_TYPE_KEYS = np.array(sorted(_BASE_BY_TYPE))
+_TYPE_BASE = np.array([_BASE_BY_TYPE[k] for k in _TYPE_KEYS])
+
+
+def _base_by_type_many(types: str | Sequence[str]) -> np.ndarray | float:
+    if isinstance(types, str):
+        return _base_by_type(types)
+    t = np.char.lower(np.asarray(types, dtype=str))
+    idx = np.minimum(np.searchsorted(_TYPE_KEYS, t), len(_TYPE_KEYS) - 1)
+    return np.where(_TYPE_KEYS[idx] == t, _TYPE_BASE[idx], 15.0)
+
+
+def _format_reasons(
+    encroachment_type: str,
+    base: float,
+    dist_component: float,
+    distance_m: float,
+    mag_component: float,
+    area_component: float,
+    compliance_ok: bool,
+) -> list[str]:
+    return [
+        f"base({encroachment_type})={base:.1f}",
+        f"dist_component={dist_component:.1f} (distance {distance_m:.1f}m)",
+        f"mag={mag_component:.1f}",
+        f"area={area_component:.1f}",
+        "non_compliant +10.0" if not compliance_ok else "compliant -5.0",
+    ]
 
 
 def compute_threat(
@@ -32,39 +78,108 @@ def compute_threat(
     compliance_ok: bool,
     magnitude: float,
     area_pixels: int,
+    with_reasons: bool = False,
 ) -> ThreatResult:
-    """Compute a 0-100 threat score with qualitative level and reasons."""
+    """Compute a 0-100 threat score with qualitative level.
+
+    Reason strings are only formatted when ``with_reasons`` is set; otherwise ``reasons`` is
+    empty.
+    """
     reasons: list[str] = []
     base = _base_by_type(encroachment_type)
-    reasons.append(f"base({encroachment_type})={base:.1f}")
 
     # Distance component: closer => higher score, cap at 50
     if distance_m < 0:
         distance_m = 0
     dist_component = max(0.0, 50.0 * (1.0 - min(distance_m, 100.0) / 100.0))
-    reasons.append(f"dist_component={dist_component:.1f} (distance {distance_m:.1f}m)")
 
     # Magnitude/area component: scale modestly
     mag_component = min(15.0, (magnitude / 255.0) * 10.0)
     area_component = min(10.0, (area_pixels / 1000.0))
-    reasons.append(f"mag={mag_component:.1f}")
-    reasons.append(f"area={area_component:.1f}")
 
     # Compliance penalty/bonus
     compliance_component = 10.0 if not compliance_ok else -5.0
-    reasons.append("non_compliant +10.0" if not compliance_ok else "compliant -5.0")
+
+    if with_reasons:
+        reasons = _format_reasons(
+            encroachment_type,
+            base,
+            dist_component,
+            distance_m,
+            mag_component,
+            area_component,
+            compliance_ok,
+        )
 
     score = base + dist_component + mag_component + area_component + compliance_component
     score = max(0.0, min(100.0, score))
 
-    if score >= 80:
-        level = "critical"
-    elif score >= 60:
-        level = "high"
-    elif score >= 40:
-        level = "medium"
-    else:
-        level = "low"
+    # bisect_right so a score equal to a cut-off takes the higher level
+    level = _LEVELS[bisect.bisect_right(_THRESHOLDS, score)]
 
     return ThreatResult(score=score, level=level, reasons=reasons)
 
+
+@dataclass
+class ThreatBatch:
+    """Scores and levels for a batch, plus the per-row components they were summed from."""
+
+    scores: np.ndarray
+    levels: np.ndarray
+    types: np.ndarray
+    distances: np.ndarray
+    base: np.ndarray
+    dist_component: np.ndarray
+    mag_component: np.ndarray
+    area_component: np.ndarray
+    compliance_ok: np.ndarray
+
+    def reasons(self) -> list[list[str]]:
+        """Reason strings per row, formatted from the stored components without re-scoring."""
+        return [
+            _format_reasons(*row)
+            for row in zip(
+                self.types.tolist(),
+                self.base.tolist(),
+                self.dist_component.tolist(),
+                self.distances.tolist(),
+                self.mag_component.tolist(),
+                self.area_component.tolist(),
+                self.compliance_ok.tolist(),
+            )
+        ]
+
+
+def compute_threat_batch(
+    types: str | Sequence[str],
+    distances: np.ndarray,
+    compliance: np.ndarray,
+    magnitudes: np.ndarray,
+    areas: np.ndarray,
+) -> ThreatBatch:
+    """Vectorized :func:`compute_threat` over arrays of detections.
+
+    ``types`` is one encroachment type for the whole batch or one per row. Reason strings are
+    only built if :meth:`ThreatBatch.reasons` is called.
+    """
+    dist_m = np.maximum(np.asarray(distances, dtype=np.float64), 0.0)
+    n = dist_m.shape[0]
+    base = np.broadcast_to(_base_by_type_many(types), n)
+    dist_c = 50.0 * (1.0 - np.minimum(dist_m, 100.0) / 100.0)
+    mag_c = np.minimum(15.0, (np.asarray(magnitudes, dtype=np.float64) / 255.0) * 10.0)
+    area_c = np.minimum(10.0, np.asarray(areas, dtype=np.float64) / 1000.0)
+    compliance_ok = np.asarray(compliance, dtype=bool)
+    comp_c = np.where(compliance_ok, -5.0, 10.0)
+    scores = np.clip(base + dist_c + mag_c + area_c + comp_c, 0.0, 100.0)
+    levels = _LEVELS_ARR[np.searchsorted(_THRESHOLDS_ARR, scores, side="right")]
+    return ThreatBatch(
+        scores=scores,
+        levels=levels,
+        types=np.broadcast_to(np.asarray(types, dtype=object), n),
+        distances=dist_m,
+        base=base,
+        dist_component=dist_c,
+        mag_component=mag_c,
+        area_component=area_c,
+        compliance_ok=compliance_ok,
+    )
@@ -1,37 +1,67 @@
+import importlib.util
 import logging
 
-try:
-    from rich.logging import RichHandler
-    _HAS_RICH = True
-except Exception:  # pragma: no cover
-    _HAS_RICH = False
+# Whether rich is installed; resolved on first setup_logging() without importing it
+_HAS_RICH: bool | None = None
 
 _LOGGING_CONFIGURED = False
 
+_PLAIN_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+class _DeferredRichHandler(logging.Handler):
+    """Create the RichHandler on the first emitted record.
+
+    Importing ``rich.logging`` pulls in most of rich, so commands that never log (``--help``,
+    quick lookups) skip that cost entirely.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._handler: logging.Handler | None = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        handler = self._handler
+        if handler is None:
+            try:
+                from rich.logging import RichHandler
+
+                handler = RichHandler(rich_tracebacks=True, markup=True)
+                handler.setFormatter(self.formatter)
+            except Exception:  # pragma: no cover
+                handler = logging.StreamHandler()
+                handler.setFormatter(logging.Formatter(_PLAIN_FORMAT))
+            self._handler = handler
+        handler.emit(record)
+
 
 def setup_logging(level: int = logging.INFO) -> None:
     """Configure root logging once.
 
     Uses RichHandler when available for better formatting.
     """
-    global _LOGGING_CONFIGURED
+    global _LOGGING_CONFIGURED, _HAS_RICH
     if _LOGGING_CONFIGURED:
         return
 
+    if _HAS_RICH is None:
+        _HAS_RICH = importlib.util.find_spec("rich") is not None
+
     if _HAS_RICH:
         logging.basicConfig(
             level=level,
             format="%(message)s",
             datefmt="[%X]",
-            handlers=[RichHandler(rich_tracebacks=True, markup=True)],
+            handlers=[_DeferredRichHandler()],
         )
     else:
-        logging.basicConfig(level=level, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+        logging.basicConfig(level=level, format=_PLAIN_FORMAT)
 
     _LOGGING_CONFIGURED = True
 
 
 def get_logger(name: str | None = None) -> logging.Logger:
-    setup_logging()
-    return logging.getLogger(name if name else "openrightofway")
-
+    # Every module calls this at import time; skip the setup call once configured
+    if not _LOGGING_CONFIGURED:
+        setup_logging()
+    return logging.getLogger(name or "openrightofway")
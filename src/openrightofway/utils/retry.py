@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import functools
+import random
+import time
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from openrightofway.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def retry(
+    max_attempts: int = 3,
+    base: float = 1.0,
+    cap: float = 30.0,
+    jitter: float = 0.5,
+    retry_on: tuple[type[BaseException], ...] = (Exception,),
+    give_up: Callable[[BaseException], bool] | None = None,
+    rng: random.Random | None = None,
+    sleep: Callable[[float], None] | None = None,
+) -> Callable[[F], F]:
+    """Retry a call on transient errors with capped exponential backoff and jitter.
+
+    The delay after failed attempt ``n`` (0-based) is ``min(cap, base * 2**n)`` scaled by a
+    random factor in ``[1 - jitter, 1 + jitter]``. Exceptions outside ``retry_on``, or for
+    which ``give_up`` returns True, are re-raised immediately. Pass a seeded ``rng`` for
+    reproducible delays.
+    """
+    if max_attempts < 1:
+        raise ValueError("max_attempts must be >= 1")
+    rand = rng or random.Random()
+
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            attempt = 0
+            while True:
+                try:
+                    return fn(*args, **kwargs)
+                except retry_on as e:
+                    if attempt + 1 >= max_attempts or (give_up is not None and give_up(e)):
+                        raise
+                    delay = min(cap, base * 2**attempt) * rand.uniform(1 - jitter, 1 + jitter)
+                    logger.warning(
+                        "%s failed (%s); retry %d/%d in %.2fs",
+                        getattr(fn, "__qualname__", fn),
+                        e,
+                        attempt + 1,
+                        max_attempts - 1,
+                        delay,
+                    )
+                    (sleep or time.sleep)(delay)
+                    attempt += 1
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+
+def _default(obj: Any) -> Any:
+    to_dict = getattr(obj, "to_dict", None)
+    if callable(to_dict):
+        return to_dict()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    tolist = getattr(obj, "tolist", None)  # NumPy scalars/arrays on the stdlib path
+    if callable(tolist):
+        return tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> str:
+    """Serialize to a compact JSON string, using orjson when installed.
+
+    Objects with a ``to_dict()`` method and other dataclasses are converted via that method
+    or ``dataclasses.asdict`` on both code paths, so output does not depend on the backend.
+    """
+    if orjson is not None:
+        options = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_SERIALIZE_NUMPY
+        return orjson.dumps(obj, default=_default, option=options).decode()
+    return json.dumps(obj, default=_default, separators=(",", ":"))
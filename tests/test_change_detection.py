@@ -21,3 +21,18 @@ def test_detect_changes(tmp_path: Path):
     assert len(dets) >= 1
     assert all(d.area > 0 for d in dets)
 
+
+def test_detect_changes_aligns_near_equal_sizes(tmp_path: Path):
+    before = np.zeros((100, 100), dtype=np.uint8)
+    after = np.zeros((101, 99), dtype=np.uint8)
+    cv2.rectangle(after, (30, 30), (70, 70), 255, -1)
+
+    before_path = tmp_path / "before.png"
+    after_path = tmp_path / "after.png"
+    cv2.imwrite(str(before_path), before)
+    cv2.imwrite(str(after_path), after)
+
+    (det,) = detect_changes(str(before_path), str(after_path), change_threshold=10, min_contour_area=50)
+    # Cropped/padded, not resampled: the rectangle keeps its exact pixel footprint
+    assert det.bbox == (30, 30, 41, 41)
+    assert det.area == 41 * 41
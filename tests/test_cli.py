@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 
 import cv2
@@ -36,3 +37,54 @@ def test_cli_train_and_detect(tmp_path: Path):
     assert res.exit_code == 0
     assert report_path.exists()
 
+
+def test_cli_pipeline_run_batch(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("OROW_MODEL_PATH", str(tmp_path / "model.joblib"))
+    monkeypatch.setenv("OROW_WORK_ORDERS_DB", str(tmp_path / "work_orders.db"))
+
+    before = np.zeros((80, 120, 3), dtype=np.uint8)
+    before_path = tmp_path / "before.png"
+    cv2.imwrite(str(before_path), before)
+    pairs = []
+    for i, radius in enumerate((10, 20)):
+        after = before.copy()
+        cv2.circle(after, (60, 40), radius, (255, 255, 255), -1)
+        after_path = tmp_path / f"after_{i}.png"
+        cv2.imwrite(str(after_path), after)
+        pairs.append({"before": str(before_path), "after": str(after_path)})
+    pairs_path = tmp_path / "pairs.json"
+    pairs_path.write_text(json.dumps(pairs), encoding="utf-8")
+
+    runner = CliRunner()
+    res = runner.invoke(app, ["pipeline-run-batch", "--pairs-json", str(pairs_path), "--workers", "2"])
+    assert res.exit_code == 0
+    runs = json.loads(res.stdout.strip().splitlines()[-1])["runs"]
+    assert [r["after"] for r in runs] == [p["after"] for p in pairs]
+    assert runs[0]["events"][0]["area"] < runs[1]["events"][0]["area"]
+
+
+def test_cli_pipeline_run_batch_isolates_failed_pair(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("OROW_MODEL_PATH", str(tmp_path / "model.joblib"))
+    monkeypatch.setenv("OROW_WORK_ORDERS_DB", str(tmp_path / "work_orders.db"))
+
+    before = np.zeros((80, 120, 3), dtype=np.uint8)
+    after = before.copy()
+    cv2.circle(after, (60, 40), 15, (255, 255, 255), -1)
+    cv2.imwrite(str(tmp_path / "before.png"), before)
+    cv2.imwrite(str(tmp_path / "after.png"), after)
+    pairs = [
+        {"before": str(tmp_path / "before.png"), "after": str(tmp_path / "missing.png")},
+        {"before": str(tmp_path / "before.png"), "after": str(tmp_path / "after.png")},
+    ]
+    pairs_path = tmp_path / "pairs.json"
+    pairs_path.write_text(json.dumps(pairs), encoding="utf-8")
+
+    runner = CliRunner()
+    res = runner.invoke(app, ["pipeline-run-batch", "--pairs-json", str(pairs_path), "--workers", "1"])
+    assert res.exit_code == 0
+    runs = json.loads(res.stdout.strip().splitlines()[-1])["runs"]
+    assert "error" in runs[0] and "events" not in runs[0]
+    assert runs[1]["events"]
+
+    res = runner.invoke(app, ["pipeline-run-batch", "--pairs-json", str(pairs_path), "--workers", "0"])
+    assert res.exit_code != 0
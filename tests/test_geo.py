@@ -0,0 +1,51 @@
+import numpy as np
+from shapely.geometry import LineString, MultiLineString, Point, Polygon
+
+from openrightofway.geospatial.geo import (
+    Corridor,
+    _transformers_for_zone,
+    _utm_zone,
+    distance_to_corridor_meters,
+    point_in_corridor_buffer,
+)
+
+
+def _corridor() -> Corridor:
+    # East-west pipeline segment near Houston
+    return Corridor(geometry=LineString([(-95.40, 29.75), (-95.35, 29.75), (-95.30, 29.75)]))
+
+
+def test_distance_and_buffer_in_meters():
+    corridor = _corridor()
+    # ~0.001 deg of latitude north of the line is ~111 m
+    d = distance_to_corridor_meters(-95.35, 29.751, corridor)
+    assert 105.0 < d < 115.0
+    assert point_in_corridor_buffer(-95.35, 29.751, corridor, buffer_meters=150.0)
+    assert not point_in_corridor_buffer(-95.35, 29.751, corridor, buffer_meters=50.0)
+
+
+def test_projected_corridor_is_cached_per_zone():
+    corridor = _corridor()
+    zone = _utm_zone(-95.35, 29.75)
+    assert corridor.projected(*zone) is corridor.projected(*zone)
+
+
+def test_indexed_distance_matches_shapely():
+    ring = [(-95.40, 29.70), (-95.30, 29.70), (-95.30, 29.80), (-95.40, 29.80)]
+    hole = [(-95.37, 29.73), (-95.33, 29.73), (-95.33, 29.77), (-95.37, 29.77)]
+    geoms = [
+        Polygon(ring, [hole]),
+        MultiLineString([[(-95.40, 29.70), (-95.35, 29.72)], [(-95.32, 29.78), (-95.30, 29.80)]]),
+    ]
+    rng = np.random.default_rng(0)
+    points = rng.uniform([-95.45, 29.65], [-95.25, 29.85], size=(50, 2))
+    for geom in geoms:
+        corridor = Corridor(geometry=geom)
+        zone = _utm_zone(-95.35, 29.75)
+        proj = corridor.projected(*zone)
+        index = corridor.segment_index(*zone)
+        for lon, lat in points:
+            x, y = _transformers_for_zone(*zone)[0].transform(lon, lat)
+            expected = proj.distance(Point(x, y))
+            assert abs(distance_to_corridor_meters(lon, lat, corridor) - expected) < 1e-6
+        assert index is corridor.segment_index(*zone)
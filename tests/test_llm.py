@@ -0,0 +1,119 @@
+import sys
+import types
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from openrightofway.core.config import Config
+from openrightofway.llm import openai_agent
+from openrightofway.llm.cache import LLMCache, make_key
+from openrightofway.llm.openai_agent import summarize_events
+
+
+class _FakeCompletions:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        msg = types.SimpleNamespace(content=f"summary #{self.calls}")
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=msg)])
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    completions = _FakeCompletions()
+
+    class OpenAI:
+        instances = 0
+
+        def __init__(self) -> None:
+            OpenAI.instances += 1
+            self.chat = types.SimpleNamespace(completions=completions)
+            # Every payload embeds identically, so only the namespace separates requests
+            item = types.SimpleNamespace(embedding=[1.0, 0.0, 0.0])
+            self.embeddings = types.SimpleNamespace(
+                create=lambda **kwargs: types.SimpleNamespace(data=[item])
+            )
+
+    mod = types.ModuleType("openai")
+    mod.OpenAI = OpenAI
+    monkeypatch.setitem(sys.modules, "openai", mod)
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    openai_agent._response_cache.cache_clear()
+    openai_agent._get_client.cache_clear()
+    yield completions
+    openai_agent._response_cache.cache_clear()
+    openai_agent._get_client.cache_clear()
+
+
+def _llm_cfg(tmp_path: Path) -> Config:
+    cfg = Config()
+    cfg.llm.enabled = True
+    cfg.llm.cache_db = str(tmp_path / "llm_cache.db")
+    return cfg
+
+
+def test_cache_roundtrip_and_ttl(tmp_path: Path):
+    cache = LLMCache(str(tmp_path / "c.db"), ttl=60)
+    key = make_key(model="m", user="u")
+    assert key == make_key(user="u", model="m")
+    assert cache.get(key) is None
+    cache.set(key, "hello")
+    assert cache.get(key) == "hello"
+
+    cache.ttl = -1  # non-positive ttl never expires
+    assert cache.get(key) == "hello"
+    cache._conn.execute("UPDATE llm_cache SET ts = ts - 120")
+    cache.ttl = 60
+    assert cache.get(key) is None
+
+
+def test_semantic_lookup_uses_cosine_threshold(tmp_path: Path):
+    cache = LLMCache(str(tmp_path / "c.db"), threshold=0.93)
+    cache.set("a", "near", np.array([1.0, 0.0, 0.0]))
+    cache.set("b", "far", np.array([0.0, 1.0, 0.0]))
+
+    assert cache.get("missing", np.array([0.99, 0.05, 0.0])) == "near"
+    assert cache.get("missing", np.array([0.7, 0.7, 0.0])) is None
+    assert cache.get("missing") is None
+    assert cache.get("missing", np.array([1.0, 0.0, 0.0]), namespace="other") is None
+
+
+def test_replacing_embedded_row_refreshes_index(tmp_path: Path):
+    cache = LLMCache(str(tmp_path / "c.db"))
+    cache.set("a", "old", np.array([1.0, 0.0]), namespace="ns")
+    assert cache.get("q", np.array([1.0, 0.0]), namespace="ns") == "old"
+    cache.set("a", "new")
+    assert cache.get("q", np.array([1.0, 0.0]), namespace="ns") is None
+
+
+def test_summarize_events_served_from_cache(tmp_path: Path, fake_openai):
+    cfg = _llm_cfg(tmp_path)
+    data = {"events": [{"threat": {"level": "high", "score": 70.0}}], "alerts": [], "tickets": []}
+
+    assert summarize_events(data, cfg) == "summary #1"
+    assert summarize_events(data, cfg) == "summary #1"
+    assert fake_openai.calls == 1
+
+    data["events"].append({"threat": {"level": "low", "score": 10.0}})
+    assert summarize_events(data, cfg) == "summary #2"
+    assert sys.modules["openai"].OpenAI.instances == 1
+
+
+def test_semantic_hits_stay_within_request_settings(tmp_path: Path, fake_openai):
+    cfg = _llm_cfg(tmp_path)
+    cfg.llm.semantic_cache = True
+    data = {"events": [{"threat": {"level": "high", "score": 70.0}}], "alerts": [], "tickets": []}
+    assert summarize_events(data, cfg) == "summary #1"
+
+    near = {**data, "events": data["events"] * 2}
+    assert summarize_events(near, cfg) == "summary #1"
+    assert fake_openai.calls == 1
+
+    cfg.llm.model = "gpt-4o"
+    assert summarize_events(data, cfg) == "summary #2"
+
+    lows = {**data, "events": [{"threat": {"level": "low", "score": 10.0}}] * 40}
+    assert summarize_events(lows, cfg) == "summary #3"
@@ -1,6 +1,8 @@
 from pathlib import Path
 
-from openrightofway.ml.filter import FalsePositiveFilter, Features
+import numpy as np
+
+from openrightofway.ml.filter import FalsePositiveFilter, Features, _label_loop, _label_numpy
 
 
 def test_ml_filter_train_and_predict(tmp_path: Path):
@@ -12,3 +14,41 @@ def test_ml_filter_train_and_predict(tmp_path: Path):
     proba = fpf.predict_proba(Features(area_pixels=2000, magnitude=200.0))
     assert 0.0 <= proba <= 1.0
 
+
+def test_fast_path_matches_sklearn(tmp_path: Path):
+    fpf = FalsePositiveFilter(str(tmp_path / "baseline.joblib"))
+    fpf.load_or_train()
+    assert fpf._linear is not None
+
+    for area, mag in [(50, 0.0), (600, 30.0), (2000, 200.0), (5000, 255.0)]:
+        feats = Features(area_pixels=area, magnitude=mag)
+        expected = float(fpf.clf.predict_proba(np.array([[area, mag]], dtype=float))[0, 1])
+        assert abs(fpf.predict_proba(feats) - expected) < 1e-12
+
+
+def test_predict_proba_many_matches_scalar(tmp_path: Path):
+    fpf = FalsePositiveFilter(str(tmp_path / "baseline.joblib"))
+    fpf.load_or_train()
+    areas = np.array([50, 600, 2000, 5000])
+    mags = np.array([0.0, 30.0, 200.0, 255.0])
+
+    batch = fpf.predict_proba_many(areas, mags)
+    scalar = [fpf.predict_proba(Features(int(a), float(m))) for a, m in zip(areas, mags)]
+    np.testing.assert_allclose(batch, scalar, rtol=1e-12)
+    assert fpf.predict_proba_many(np.array([]), np.array([])).shape == (0,)
+
+    fpf._linear = None  # sklearn fallback path
+    np.testing.assert_allclose(fpf.predict_proba_many(areas, mags), scalar, rtol=1e-9)
+    assert abs(fpf.predict_proba(Features(2000, 200.0)) - scalar[2]) < 1e-9
+
+
+def test_label_loop_matches_numpy():
+    rng = np.random.default_rng(0)
+    area = rng.integers(50, 5000, size=200)
+    mag = rng.uniform(0, 255, size=200)
+    noise = rng.normal(0, 0.5, size=200)
+
+    X_loop, y_loop = _label_loop(area, mag, noise)
+    X_np, y_np = _label_numpy(area, mag, noise)
+    np.testing.assert_array_equal(X_loop, X_np)
+    np.testing.assert_array_equal(y_loop, y_np)
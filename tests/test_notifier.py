@@ -0,0 +1,201 @@
+import smtplib
+import sys
+import types
+
+import pytest
+
+from openrightofway.alerts.notifier import (
+    Notifier,
+    NotifierEnv,
+    SMTPPool,
+    _is_permanent,
+    _load_env_once,
+    _twilio_client,
+    load_attachment,
+)
+
+
+def _env(**overrides) -> NotifierEnv:
+    base = dict.fromkeys(NotifierEnv._fields)
+    base["smtp_port"] = 587
+    return NotifierEnv(**{**base, **overrides})
+
+
+class _FakeMessages:
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+
+    def create(self, body: str, from_: str, to: str) -> None:
+        if to == "+bad":
+            raise RuntimeError("rejected")
+        self.sent.append(to)
+
+
+@pytest.fixture
+def fake_twilio(monkeypatch):
+    messages = _FakeMessages()
+
+    class Client:
+        def __init__(self, sid: str, token: str) -> None:
+            self.messages = messages
+
+    rest = types.ModuleType("twilio.rest")
+    rest.Client = Client
+    exceptions = types.ModuleType("twilio.base.exceptions")
+    exceptions.TwilioRestException = type("TwilioRestException", (Exception,), {})
+    monkeypatch.setitem(sys.modules, "twilio", types.ModuleType("twilio"))
+    monkeypatch.setitem(sys.modules, "twilio.rest", rest)
+    monkeypatch.setitem(sys.modules, "twilio.base", types.ModuleType("twilio.base"))
+    monkeypatch.setitem(sys.modules, "twilio.base.exceptions", exceptions)
+    _twilio_client.cache_clear()
+    yield messages
+    _twilio_client.cache_clear()
+
+
+def test_send_sms_collects_per_recipient_errors(fake_twilio):
+    n = Notifier(_env(twilio_sid="sid", twilio_token="token", twilio_from="+1000"))
+
+    results = n.send_sms(["+1", "+bad", "+2"], "hello")
+
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], RuntimeError)
+    assert sorted(fake_twilio.sent) == ["+1", "+2"]
+
+
+class _FakeSMTP:
+    instances: list["_FakeSMTP"] = []
+
+    def __init__(self, host: str, port: int) -> None:
+        self.logins = 0
+        self.sent: list[object] = []
+        self.closed = False
+        _FakeSMTP.instances.append(self)
+
+    def starttls(self) -> None:
+        pass
+
+    def login(self, username: str, password: str) -> None:
+        self.logins += 1
+
+    def noop(self) -> tuple[int, bytes]:
+        return (250, b"OK")
+
+    def send_message(self, msg, **kwargs) -> None:
+        self.sent.append(msg)
+
+    def quit(self) -> None:
+        self.closed = True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_smtp_pool_reuses_and_recycles_sessions(monkeypatch):
+    _FakeSMTP.instances = []
+    monkeypatch.setattr(smtplib, "SMTP", _FakeSMTP)
+    pool = SMTPPool("smtp.test", 587, "user", "pw", max_messages=2)
+
+    for i in range(3):
+        with pool.connection() as conn:
+            conn.send_message(f"msg {i}")
+
+    first, second = _FakeSMTP.instances
+    assert first.logins == 1 and len(first.sent) == 2 and first.closed
+    assert second.logins == 1 and len(second.sent) == 1 and not second.closed
+    pool.close()
+    assert second.closed
+
+
+def test_send_emails_bulk_uses_one_session(monkeypatch):
+    _FakeSMTP.instances = []
+    monkeypatch.setattr(smtplib, "SMTP", _FakeSMTP)
+    n = Notifier(_env(smtp_host="bulk.smtp.test", smtp_username="user", smtp_password="pw"))
+
+    msgs = [n.build_email(["a@example.com", "b@example.com"], f"s{i}", "body") for i in range(3)]
+    n.send_emails_bulk(msgs)
+
+    (server,) = _FakeSMTP.instances
+    assert server.logins == 1
+    assert server.sent == msgs
+
+
+class _EnvelopeSMTP(_FakeSMTP):
+    """Runs smtplib's real send_message so recipients come from the headers."""
+
+    send_message = smtplib.SMTP.send_message
+
+    def ehlo_or_helo_if_needed(self) -> None:
+        pass
+
+    def sendmail(self, from_addr, to_addrs, msg, mail_options=(), rcpt_options=()) -> dict:
+        if b"Subject: bad" in msg:
+            raise smtplib.SMTPDataError(554, b"rejected")
+        self.sent.append((list(to_addrs), msg))
+        return {}
+
+
+def test_send_emails_bulk_delivers_cc_and_bcc(monkeypatch):
+    _FakeSMTP.instances = []
+    monkeypatch.setattr(smtplib, "SMTP", _EnvelopeSMTP)
+    n = Notifier(_env(smtp_host="cc.smtp.test", smtp_username="user", smtp_password="pw"))
+    msg = n.build_email(["t@x"], "hello", "body")
+    msg["Cc"] = "c@x"
+    msg["Bcc"] = "b@x"
+
+    assert n.send_emails_bulk([msg]) == [None]
+
+    ((to_addrs, raw),) = _FakeSMTP.instances[0].sent
+    assert sorted(to_addrs) == ["b@x", "c@x", "t@x"]
+    assert b"Bcc" not in raw
+
+
+def test_send_emails_bulk_skips_rejected_message(monkeypatch):
+    _FakeSMTP.instances = []
+    monkeypatch.setattr(smtplib, "SMTP", _EnvelopeSMTP)
+    n = Notifier(_env(smtp_host="reject.smtp.test", smtp_username="user", smtp_password="pw"))
+    msgs = [n.build_email(["a@x"], subject, "body") for subject in ("first", "bad", "third")]
+
+    results = n.send_emails_bulk(msgs, flush_every=2)
+
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], smtplib.SMTPDataError)
+    sent = [raw for server in _FakeSMTP.instances for _, raw in server.sent]
+    assert len(sent) == 2 and b"Subject: third" in sent[1]
+
+
+def test_build_email_guesses_attachment_type(tmp_path):
+    report = tmp_path / "report.json"
+    report.write_text('{"events": []}', encoding="utf-8")
+    att = load_attachment(str(report))
+    n = Notifier(_env())
+
+    for msg in (n.build_email(["a@example.com"], "s", "b", [str(report)]), n.build_email(["b@example.com"], "s", "b", [att])):
+        (part,) = list(msg.iter_attachments())
+        assert part.get_content_type() == "application/json"
+        assert part.get_filename() == "report.json"
+
+
+def test_env_is_read_on_first_notifier(monkeypatch):
+    monkeypatch.setenv("SMTP_PORT", "not-a-port")
+    _load_env_once.cache_clear()
+    try:
+        assert Notifier(_env()).smtp_port == 587
+        with pytest.raises(ValueError):
+            Notifier()
+    finally:
+        _load_env_once.cache_clear()
+
+
+@pytest.mark.parametrize(
+    ("exc", "permanent"),
+    [
+        (smtplib.SMTPAuthenticationError(535, b"bad creds"), True),
+        (smtplib.SMTPRecipientsRefused({"a@x": (550, b"no such user")}), True),
+        (smtplib.SMTPSenderRefused(553, b"bad sender", "me@x"), True),
+        (smtplib.SMTPDataError(554, b"rejected"), True),
+        (smtplib.SMTPDataError(451, b"try later"), False),
+        (smtplib.SMTPServerDisconnected("gone"), False),
+    ],
+)
+def test_is_permanent_smtp(exc, permanent):
+    assert _is_permanent(exc) is permanent
@@ -0,0 +1,35 @@
+import random
+
+import pytest
+
+from openrightofway.utils.retry import retry
+
+
+def test_retry_backs_off_then_succeeds():
+    delays: list[float] = []
+    calls = {"n": 0}
+
+    @retry(max_attempts=4, base=1.0, cap=3.0, jitter=0.5, retry_on=(OSError,), rng=random.Random(0), sleep=delays.append)
+    def flaky() -> str:
+        calls["n"] += 1
+        if calls["n"] < 4:
+            raise ConnectionResetError("reset")
+        return "ok"
+
+    assert flaky() == "ok"
+    assert len(delays) == 3
+    for attempt, delay in enumerate(delays):
+        nominal = min(3.0, 2**attempt)
+        assert 0.5 * nominal <= delay <= 1.5 * nominal
+
+
+def test_retry_gives_up_immediately_on_permanent_error():
+    delays: list[float] = []
+
+    @retry(retry_on=(ValueError,), give_up=lambda e: "fatal" in str(e), sleep=delays.append)
+    def broken() -> None:
+        raise ValueError("fatal")
+
+    with pytest.raises(ValueError):
+        broken()
+    assert delays == []
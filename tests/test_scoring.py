@@ -1,4 +1,6 @@
-from openrightofway.scoring.threat import compute_threat
+import numpy as np
+
+from openrightofway.scoring.threat import compute_threat, compute_threat_batch
 
 
 def test_scoring_distance_effect():
@@ -6,3 +8,55 @@ def test_scoring_distance_effect():
     far = compute_threat(encroachment_type="structure", distance_m=100.0, compliance_ok=False, magnitude=200.0, area_pixels=2000)
     assert close.score > far.score
 
+
+def test_batch_matches_scalar():
+    types = ["structure", "Road", "water", "boat", "unknown", "equipment"]
+    distances = np.array([-3.0, 5.0, 50.0, 99.0, 150.0, 0.0])
+    compliance = np.array([False, True, False, True, False, True])
+    mags = np.array([255.0, 10.0, 120.0, 200.0, 0.0, 90.0])
+    areas = np.array([20000, 50, 800, 3000, 10, 4500])
+
+    batch = compute_threat_batch(types, distances, compliance, mags, areas)
+    reasons = batch.reasons()
+    for i, t in enumerate(types):
+        r = compute_threat(
+            t, float(distances[i]), bool(compliance[i]), float(mags[i]), int(areas[i]), with_reasons=True
+        )
+        assert batch.scores[i] == r.score
+        assert batch.levels[i] == r.level
+        assert reasons[i] == r.reasons
+
+    single_type = compute_threat_batch("road", distances, compliance, mags, areas)
+    assert single_type.reasons()[0][0] == "base(road)=35.0"
+
+    empty = compute_threat_batch("road", [], [], [], [])
+    assert empty.scores.shape == empty.levels.shape == (0,)
+    assert empty.reasons() == []
+
+
+def test_reasons_only_when_requested():
+    args = ("road", 20.0, True, 100.0, 500)
+    assert compute_threat(*args).reasons == []
+    detailed = compute_threat(*args, with_reasons=True)
+    assert detailed.score == compute_threat(*args).score
+    assert detailed.reasons[0] == "base(road)=35.0"
+    assert detailed.reasons[-1] == "compliant -5.0"
+
+
+def test_level_boundaries():
+    # (type, distance_m, compliance_ok, magnitude, area_pixels) -> score, level
+    cases = [
+        (("structure", 100.0, True, 0.0, 4999), 39.999, "low"),
+        (("structure", 100.0, True, 0.0, 5000), 40.0, "medium"),
+        (("structure", 100.0, False, 0.0, 9999), 59.999, "medium"),
+        (("structure", 100.0, False, 0.0, 10000), 60.0, "high"),
+        (("structure", 50.0, False, 0.0, 5000), 80.0, "critical"),
+    ]
+    for args, score, level in cases:
+        r = compute_threat(*args)
+        assert r.score == score and r.level == level
+
+    cols = list(zip(*(args for args, _, _ in cases)))
+    batch = compute_threat_batch(list(cols[0]), *(np.array(c) for c in cols[1:]))
+    assert batch.scores.tolist() == [score for _, score, _ in cases]
+    assert batch.levels.tolist() == [level for _, _, level in cases]
@@ -0,0 +1,53 @@
+import sqlite3
+from pathlib import Path
+
+from openrightofway.integrations.work_orders import WorkOrderManager
+
+
+def test_create_many_assigns_ids_in_order(tmp_path: Path):
+    wom = WorkOrderManager(str(tmp_path / "wo.db"))
+    first = wom.create(title="t0", description="d0")
+
+    orders = wom.create_many(
+        [
+            ("t1", "d1", "high", 29.7, -95.3, None),
+            ("t2", "d2", "critical", None, None, "evidence.png"),
+        ]
+    )
+
+    assert [wo.id for wo in orders] == [first.id + 1, first.id + 2]
+    assert wom.get(orders[1].id) == orders[1]
+    assert wom.update_status(orders[0].id, "closed")
+    assert wom.get(orders[0].id).status == "closed"
+
+
+def test_manager_uses_wal_and_closes(tmp_path: Path):
+    wom = WorkOrderManager(str(tmp_path / "wo.db"))
+    assert wom._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    indexes = {row[1] for row in wom._conn.execute("PRAGMA index_list(work_orders)")}
+    assert "idx_wo_status" in indexes
+    wo = wom.create(title="t", description="d")
+    wom.close()
+    wom.close()
+
+    reopened = WorkOrderManager(str(tmp_path / "wo.db"))
+    assert reopened.get(wo.id) == wo
+
+
+def test_create_many_empty_is_noop(tmp_path: Path):
+    wom = WorkOrderManager(str(tmp_path / "wo.db"))
+    assert wom.create_many([]) == []
+    assert wom.create(title="t", description="d").id == 1
+
+
+def test_immutable_reader_sees_rows(tmp_path: Path):
+    db = tmp_path / "wo.db"
+    wom = WorkOrderManager(str(db))
+    immutable = f"file:{db}?immutable=1"
+    with sqlite3.connect(immutable, uri=True) as ro:
+        assert ro.execute("SELECT COUNT(*) FROM work_orders").fetchone()[0] == 0
+
+    wom.create(title="t", description="d")
+    wom.close()
+    with sqlite3.connect(immutable, uri=True) as ro:
+        assert ro.execute("SELECT COUNT(*) FROM work_orders").fetchone()[0] == 1